@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""Benchmark the verifier's network layer against a local fake museum server.
+
+Starts a synthetic museum server that answers the stand-in transport's
+/fetch?url=<source url> requests with per-host latency distributions,
+error rates (403 / 500 storms), stalls past the request timeout, redirect
+chains and configurable page sizes. Then runs the real verification
+pipeline (fetch_title, build_source_records, scoring) over generated rows
+at several scales and concurrency levels, and reports throughput, fetch
+tail latency and bytes read.
+
+Every response is derived from a hash of its URL, so repeated runs see the
+same workload. Results are written to screen_results/bench/ so runs can be
+compared.
+
+Usage:
+    python3 scripts/bench_network.py --rows 200,1000 --concurrency 2,4,8
+    python3 scripts/bench_network.py --compare screen_results/bench/network-20261019-120000.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, quote, urlparse
+
+import build_verified_works as bvw
+from fetch_transport import STANDIN_FINAL_URL_HEADER, StandinTransport
+from host_timeouts import HedgeBudget, HostLatencyTracker
+from run_metrics import RunMetrics, percentile
+
+
+ROOT = Path(__file__).resolve().parents[1]
+BENCH_DIR = ROOT / "screen_results" / "bench"
+
+
+@dataclass(frozen=True)
+class HostProfile:
+    median_ms: float
+    sigma: float = 0.4
+    error_rate: float = 0.0
+    error_status: int = 500
+    stall_rate: float = 0.0
+    redirect_rate: float = 0.0
+
+
+# Named after the kinds of hosts the real table links to, not the hosts themselves.
+HOST_PROFILES: Dict[str, HostProfile] = {
+    "collections.fast-museum.test": HostProfile(median_ms=40, sigma=0.3),
+    "www.slow-museum.test": HostProfile(median_ms=450, sigma=0.7, stall_rate=0.02),
+    "www.forbidden-gallery.test": HostProfile(median_ms=80, error_rate=0.35, error_status=403),
+    "library.research.test": HostProfile(median_ms=150, sigma=0.5, error_rate=0.05, redirect_rate=0.3),
+    "en.wikipedia.org": HostProfile(median_ms=60, sigma=0.3, redirect_rate=0.1),
+}
+
+VOCAB = [
+    "Chair", "Vase", "Cabinet", "Mask", "Figure", "Throne", "Wallpaper", "Teapot", "Sideboard", "Peacock",
+    "Dragonfly", "Candelabrum", "Decanter", "Pendant", "Wrapper", "Cushion", "Ivory", "Bronze", "Porcelain",
+]
+NAMES = ["Émile Gallé", "Christopher Dresser", "William Morris", "Josef Hoffmann", "Hector Guimard", "Owen Jones"]
+
+
+class FakeMuseum:
+    def __init__(self, body_kb: int, timeout: float, latency_scale: float, seed: int) -> None:
+        self.body_kb = body_kb
+        self.timeout = timeout
+        self.latency_scale = latency_scale
+        self.seed = seed
+        self.lock = threading.Lock()
+        self.attempts: Dict[str, int] = {}
+
+    def next_attempt(self, key: str) -> int:
+        # Repeated requests for a URL (hedges, later runs) draw fresh latency.
+        with self.lock:
+            n = self.attempts.get(key, 0)
+            self.attempts[key] = n + 1
+        return n
+
+    def rng(self, url: str) -> random.Random:
+        digest = hashlib.sha256(f"{self.seed}:{url}".encode("utf-8")).hexdigest()
+        return random.Random(int(digest[:16], 16))
+
+    def redirect_hops(self, url: str, profile: HostProfile) -> int:
+        rng = self.rng(url + "#redirect")
+        return rng.randint(1, 3) if rng.random() < profile.redirect_rate else 0
+
+    def page(self, url: str) -> bytes:
+        rng = self.rng(url + "#page")
+        words = " ".join(rng.sample(VOCAB, 3))
+        name = rng.choice(NAMES)
+        head = (
+            "<!doctype html><html><head><meta charset=\"utf-8\">"
+            f"<title>{words} - {name} | {urlparse(url).hostname}</title>"
+            f"<meta name=\"description\" content=\"{name} | {rng.choice(VOCAB)} | c. {rng.randint(1850, 1910)}\">"
+            "</head><body>"
+        ).encode("utf-8")
+        return head + b"<p>" + b"x" * max(0, self.body_kb * 1024 - len(head)) + b"</p></body></html>"
+
+
+class FakeMuseumHandler(BaseHTTPRequestHandler):
+    museum: FakeMuseum
+
+    def log_message(self, fmt: str, *args) -> None:
+        pass
+
+    def reply(self, status: int, headers: List[Tuple[str, str]], body: bytes) -> None:
+        try:
+            self.send_response(status)
+            for k, v in headers:
+                self.send_header(k, v)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The verifier hangs up after </head>; that is the point.
+            pass
+
+    def do_GET(self) -> None:
+        query = parse_qs(urlparse(self.path).query)
+        url = (query.get("url") or [""])[0]
+        hop = int((query.get("hop") or ["0"])[0])
+        host = urlparse(url).hostname or ""
+        profile = HOST_PROFILES.get(host, HostProfile(median_ms=100))
+        museum = self.museum
+        rng = museum.rng(f"{url}|{hop}|{museum.next_attempt(f'{url}|{hop}')}")
+
+        if rng.random() < profile.stall_rate:
+            time.sleep(museum.timeout + 0.5)
+            return
+        time.sleep(rng.lognormvariate(math.log(profile.median_ms), profile.sigma) * museum.latency_scale / 1000)
+        if hop == 0 and museum.rng(url + "#error").random() < profile.error_rate:
+            self.reply(profile.error_status, [("Content-Type", "text/html")], b"<html><head><title>Error</title></head></html>")
+            return
+        if hop < museum.redirect_hops(url, profile):
+            self.reply(302, [("Location", f"/fetch?url={quote(url, safe='')}&hop={hop + 1}")], b"")
+            return
+        self.reply(200, [("Content-Type", "text/html; charset=utf-8"), (STANDIN_FINAL_URL_HEADER, url)], museum.page(url))
+
+
+def start_server(museum: FakeMuseum) -> ThreadingHTTPServer:
+    handler = type("ConfiguredFakeMuseumHandler", (FakeMuseumHandler,), {"museum": museum})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def synthetic_tasks(n_rows: int, page_pool: int, seed: int) -> List[bvw.RowTask]:
+    rng = random.Random(seed)
+    hosts = sorted(HOST_PROFILES)
+    pages = [f"https://{rng.choice(hosts)}/objects/{i}" for i in range(page_pool)]
+    tasks = []
+    for i in range(n_rows):
+        title = " ".join(rng.sample(VOCAB, rng.randint(2, 4)))
+        row = {
+            "id": f"bench-{i:06d}",
+            "title": title,
+            "author": rng.choice(NAMES),
+            "year_creation": str(rng.randint(1850, 1910)),
+            "period_creation": "",
+            "course": "bench",
+        }
+        urls = bvw.split_source_urls(" | ".join(rng.sample(pages, rng.randint(2, 5))))
+        tasks.append(
+            bvw.RowTask(
+                global_idx=i + 1,
+                row=row,
+                item_id=row["id"],
+                title=title,
+                relevance_title=title,
+                author=row["author"],
+                year_expr=row["year_creation"],
+                source_urls=urls,
+                fingerprint=bvw.row_fingerprint(row, row["id"], urls),
+            )
+        )
+    return tasks
+
+
+def run_scenario(base_url: str, tasks: List[bvw.RowTask], concurrency: int, hedge_fraction: float) -> Dict[str, object]:
+    bvw.TRANSPORT = StandinTransport(base_url)
+    bvw.METRICS = RunMetrics()
+    bvw.LATENCY = HostLatencyTracker()
+    bvw.HEDGE = HedgeBudget(hedge_fraction) if hedge_fraction > 0 else None
+    cache: Dict[str, Dict[str, str]] = {}
+    t0 = time.perf_counter()
+    statuses: Dict[str, int] = {}
+    for out_row, _ in bvw.run_verification_pipeline(tasks, cache, {}, row_workers=concurrency, fetch_workers=concurrency * 2):
+        statuses[out_row["status"]] = statuses.get(out_row["status"], 0) + 1
+    wall = time.perf_counter() - t0
+
+    metrics = bvw.METRICS.to_dict()
+    latencies = sorted(ms for h in bvw.METRICS.hosts.values() for ms in h.latencies_ms)
+    return {
+        "rows": len(tasks),
+        "concurrency": concurrency,
+        "wall_seconds": round(wall, 3),
+        "rows_per_second": round(len(tasks) / wall, 2) if wall else 0.0,
+        "requests": metrics["requests"],
+        "bytes_fetched": metrics["bytes_fetched"],
+        "timeouts": metrics["timeouts"],
+        "fetch_latency_ms": {f"p{p}": round(percentile(latencies, p), 1) for p in (50, 95, 99)}
+        | {"max": round(latencies[-1], 1) if latencies else 0.0},
+        "statuses": dict(sorted(statuses.items())),
+        "hedged_requests": metrics["counters"].get("hedged_requests", 0),
+        "hedge_wins": metrics["counters"].get("hedge_wins", 0),
+        "host_p95_ms": {h: v["latency_ms"]["p95"] for h, v in metrics["hosts"].items()},
+    }
+
+
+def scenario_key(r: Dict[str, object]) -> Tuple[int, int]:
+    return int(r["rows"]), int(r["concurrency"])
+
+
+def print_results(results: List[Dict[str, object]], baseline: Optional[Dict[Tuple[int, int], Dict[str, object]]] = None) -> None:
+    print(f"{'rows':>6} {'conc':>4} {'wall s':>8} {'rows/s':>8} {'reqs':>6} {'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7} {'timeouts':>8} {'bytes':>11}")
+    for r in results:
+        lat = r["fetch_latency_ms"]
+        line = (
+            f"{r['rows']:>6} {r['concurrency']:>4} {r['wall_seconds']:>8.2f} {r['rows_per_second']:>8.1f} {r['requests']:>6} "
+            f"{lat['p50']:>7.0f} {lat['p95']:>7.0f} {lat['p99']:>7.0f} {r['timeouts']:>8} {r['bytes_fetched']:>11,}"
+        )
+        before = (baseline or {}).get(scenario_key(r))
+        if before:
+            line += f"  (rows/s was {before['rows_per_second']:.1f}, p99 was {before['fetch_latency_ms']['p99']:.0f})"
+        print(line)
+
+
+def parse_int_list(raw: str) -> List[int]:
+    return [int(x) for x in raw.split(",") if x.strip()]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=parse_int_list, default=[200, 1000], help="comma-separated row counts")
+    parser.add_argument("--concurrency", type=parse_int_list, default=[2, 4, 8], help="comma-separated row worker counts")
+    parser.add_argument("--page-pool", type=int, default=0, help="distinct source pages (default: rows * 2)")
+    parser.add_argument("--body-kb", type=int, default=64, help="page size; the verifier should read only the <head>")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="multiply every host's latency")
+    parser.add_argument("--timeout", type=float, default=2.0, help="per-request timeout used by the verifier")
+    parser.add_argument("--fixed-timeout", action="store_true", help="disable per-host adaptive timeouts")
+    parser.add_argument("--hedge", type=float, default=0.0, metavar="FRACTION", help="enable hedged requests, capped at FRACTION of requests")
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--out", type=Path, default=BENCH_DIR)
+    parser.add_argument("--compare", type=Path, default=None, help="earlier results file to show alongside")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        if not args.compare.exists():
+            print(f"Missing input: {args.compare}", file=sys.stderr)
+            return 1
+        baseline = {scenario_key(r): r for r in json.loads(args.compare.read_text(encoding="utf-8"))["results"]}
+
+    bvw.TIMEOUT = args.timeout
+    bvw.ADAPTIVE_TIMEOUTS = not args.fixed_timeout
+    museum = FakeMuseum(args.body_kb, args.timeout, args.latency_scale, args.seed)
+    server = start_server(museum)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    results = []
+    try:
+        for n_rows in args.rows:
+            tasks = synthetic_tasks(n_rows, args.page_pool or n_rows * 2, args.seed)
+            for concurrency in args.concurrency:
+                result = run_scenario(base_url, tasks, concurrency, args.hedge)
+                results.append(result)
+                print_results([result], baseline)
+    finally:
+        server.shutdown()
+
+    args.out.mkdir(parents=True, exist_ok=True)
+    out_path = args.out / f"network-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    payload = {
+        "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "config": {
+            "body_kb": args.body_kb,
+            "latency_scale": args.latency_scale,
+            "timeout": args.timeout,
+            "adaptive_timeouts": not args.fixed_timeout,
+            "hedge_max_fraction": args.hedge,
+            "seed": args.seed,
+            "hosts": {h: asdict(p) for h, p in HOST_PROFILES.items()},
+        },
+        "results": results,
+    }
+    out_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    print(f"Wrote {out_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""Benchmark source relevance scoring on a synthetic workload.
+
+Builds N synthetic works with 4 sources each (drawn from a shared page pool,
+as museum essays are shared across rows in the real table), scores every
+(work, source) pair the way a verification run does -- once from
+build_specific_backgrounds and again from is_source_set_sufficient -- and
+compares the precomputed-token engine against the previous per-call
+implementation. Exits non-zero if any score differs.
+
+Usage:
+    python3 scripts/bench_relevance.py --works 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import sys
+import time
+from typing import List, Tuple
+
+import build_verified_works as bvw
+
+
+VOCAB = [
+    "Chair", "Vase", "Cabinet", "Mask", "Figure", "Throne", "Wallpaper", "Teapot", "Sideboard", "Peacock",
+    "Dragonfly", "Libellule", "Candelabrum", "Decanter", "Pendant", "Wrapper", "Cushion", "Saltcellar",
+    "Mangaaka", "Nkisi", "Kongo", "Bamana", "Dogon", "Yoruba", "Gothic", "Nouveau", "Reform", "Exhibition",
+    "Gallery", "Studio", "Interior", "Textile", "Ivory", "Bronze", "Porcelain", "Lithograph", "Poster",
+]
+NAMES = [
+    "Émile Gallé", "Henry van de Velde", "Christopher Dresser", "William Morris", "Josef Hoffmann",
+    "Louis Majorelle", "René Lalique", "Owen Jones", "Walter Crane", "Hector Guimard", "Adolf Loos",
+]
+HOSTS = ["www.metmuseum.org", "collections.vam.ac.uk", "www.britishmuseum.org", "en.wikipedia.org", "archive.org"]
+
+
+def legacy_source_relevance_for_work(source: bvw.SourceRecord, title: str, author: str) -> Tuple[int, int, int]:
+    hay = bvw.fold_text(f"{source.page_title} {source.meta_description} {source.url}")
+    title_tokens = [bvw.fold_text(t) for t in bvw.significant_title_tokens(title)]
+    author_tokens = {bvw.fold_text(t) for t in bvw.significant_title_tokens(author)}
+    lead_name_match = re.match(r"^\W*([A-Z][a-z]+)(?:\s+([A-Z][a-z]+))?(?:\s+([A-Z][a-z]+))?", title or "")
+    if lead_name_match:
+        lead_words = [g.lower() for g in lead_name_match.groups() if g]
+        looks_objectish = any(w in bvw.OBJECTISH_LEAD_WORDS for w in lead_words)
+        first_is_article = bool(lead_words) and lead_words[0] in {"the", "a", "an"}
+        comma_author_prefix = "," in (title or "")[:50] and len(lead_words) >= 2 and not looks_objectish
+        no_comma_author_prefix = len(lead_words) in {2, 3} and not first_is_article and not looks_objectish
+        if comma_author_prefix or no_comma_author_prefix:
+            for g in lead_name_match.groups():
+                if g:
+                    author_tokens.add(bvw.fold_text(g))
+    title_specific_tokens = [t for t in title_tokens if t not in author_tokens]
+    title_score = sum(2 for t in title_specific_tokens if t in hay)
+    author_score = sum(3 for t in author_tokens if t in hay)
+    score = title_score + author_score
+    if "/art/collection/search/" in source.url and score > 0:
+        score += 1
+    return score, title_score, author_score
+
+
+def synthetic_page(rng: random.Random, idx: int) -> Tuple[str, str, str]:
+    words = rng.sample(VOCAB, 4)
+    name = rng.choice(NAMES)
+    host = rng.choice(HOSTS)
+    path = f"/art/collection/search/{100000 + idx}" if host == "www.metmuseum.org" else f"/item/O{idx}/{'-'.join(w.lower() for w in words[:2])}"
+    title = f"{' '.join(words[:3])} - {name}"
+    meta = f"{name} | {words[3]} | {rng.choice(VOCAB)} | c. {rng.randint(1800, 1910)}"
+    return title, meta, f"https://{host}{path}"
+
+
+def synthetic_work(rng: random.Random) -> Tuple[str, str]:
+    name = rng.choice(NAMES)
+    words = " ".join(rng.sample(VOCAB, rng.randint(2, 5)))
+    title = f"{name}, {words}" if rng.random() < 0.4 else words
+    return title, name if rng.random() < 0.7 else f"{rng.choice(['France', 'Britain', 'Kongo'])} artist"
+
+
+def make_records(pages: List[Tuple[str, str, str]], picks: List[int]) -> List[bvw.SourceRecord]:
+    return [
+        bvw.SourceRecord(
+            institution=bvw.institution_for_url(pages[i][2]),
+            page_title=pages[i][0],
+            meta_description=pages[i][1],
+            url=pages[i][2],
+            tier=bvw.source_tier(pages[i][2]),
+            status="http_200",
+        )
+        for i in picks
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--works", type=int, default=100_000)
+    parser.add_argument("--sources-per-work", type=int, default=4)
+    parser.add_argument("--page-pool", type=int, default=5_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    pages = [synthetic_page(rng, i) for i in range(args.page_pool)]
+    workload = [(synthetic_work(rng), [rng.randrange(args.page_pool) for _ in range(args.sources_per_work)]) for _ in range(args.works)]
+    calls_per_pair = 2
+
+    t0 = time.perf_counter()
+    legacy = []
+    for (title, author), picks in workload:
+        for record in make_records(pages, picks):
+            for _ in range(calls_per_pair):
+                result = legacy_source_relevance_for_work(record, title, author)
+            legacy.append(result)
+    legacy_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    current = []
+    for (title, author), picks in workload:
+        for record in make_records(pages, picks):
+            for _ in range(calls_per_pair):
+                score = bvw.source_relevance_for_work(record, title, author)
+            current.append((score, record.title_specific_relevance, record.author_relevance))
+    current_s = time.perf_counter() - t0
+
+    pairs = len(legacy)
+    mismatches = sum(1 for a, b in zip(legacy, current) if a != b)
+    print(f"works={args.works} sources/work={args.sources_per_work} pairs={pairs} calls/pair={calls_per_pair}")
+    print(f"legacy:  {legacy_s:.2f}s ({pairs * calls_per_pair / legacy_s:,.0f} calls/s)")
+    print(f"current: {current_s:.2f}s ({pairs * calls_per_pair / current_s:,.0f} calls/s)")
+    print(f"speedup: {legacy_s / current_s:.2f}x")
+    if mismatches:
+        print(f"MISMATCH: {mismatches} of {pairs} scores differ", file=sys.stderr)
+        return 1
+    print("scores identical")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""Benchmark the verifier's CPU path: scoring and background generation.
+
+Builds synthetic rows and SourceRecord sets (pages drawn from a shared pool,
+as in scripts/bench_relevance.py, with a mix of reachable, blocked, missing
+and Wikipedia-only sources) and runs verify_row on each, which covers
+source_relevance_for_work, is_source_set_sufficient, choose_primary_source,
+build_specific_backgrounds and classify_needs_human_detail. No network.
+
+Reports rows/s per scale and, from a separate tracemalloc pass, peak and
+retained allocations. The committed golden file holds a digest of every
+status, note and background, recorded from the scoring code before it was
+optimized; a run fails if any output differs from it, or if the golden file
+has no entry for a requested scale, seed and page pool. --update-golden
+re-records it (only after an intended output change).
+
+Each scale also runs the rows through build_source_records with and without
+the --early-exit skip and fails if any column in EARLY_EXIT_FIELDS differs.
+
+Usage:
+    python3 scripts/bench_scoring.py                     # timings + golden check
+    python3 scripts/bench_scoring.py --update-golden     # after an intended output change
+    python3 scripts/bench_scoring.py --scales 1000,10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import hashlib
+import json
+import random
+import sys
+import time
+import tracemalloc
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import build_verified_works as bvw
+from bench_relevance import synthetic_page, synthetic_work
+
+
+ROOT = Path(__file__).resolve().parents[1]
+BENCH_DIR = ROOT / "screen_results" / "bench"
+GOLDEN_JSON = BENCH_DIR / "scoring_golden.json"
+DEFAULT_SCALES = [1_000, 10_000, 100_000]
+# Golden digests are also kept per chunk so a mismatch points at a row range.
+GOLDEN_CHUNK = 1_000
+# The tracemalloc pass is slow; it runs on at most this many rows.
+ALLOC_ROWS = 10_000
+
+MATERIALS = ["Oak", "Glass", "Earthenware", "Silver", "Ivory", "Wool", "Bronze", "Porcelain", ""]
+STYLES = ["Art Nouveau", "Gothic Revival", "Aesthetic Movement", "Arts and Crafts", ""]
+REGIONS = ["France", "Britain", "Central Africa", "Austria", "Belgium", ""]
+COURSES = ["art_nouveau", "industrial_reform", "african_art"]
+PERIODS = ["19th century", "late 19th century", "early 20th century", ""]
+# (status, share): most sources load; some are blocked or gone.
+SOURCE_STATUSES = [("http_200", 0.8), ("http_403", 0.08), ("http_404", 0.07), ("url_error:timed out", 0.05)]
+
+# Columns that must not depend on --early-exit; sources and source_count
+# list only the fetched pages, so they may.
+EARLY_EXIT_FIELDS = ["confirmed_year_expr", "historical_background_zh", "historical_background_en", "status", "status_detail", "notes"]
+
+# One synthetic row: (task, [(page index, status)])
+Workload = List[Tuple[bvw.RowTask, List[Tuple[int, str]]]]
+
+
+def pick_status(rng: random.Random) -> str:
+    x = rng.random()
+    for status, share in SOURCE_STATUSES:
+        if x < share:
+            return status
+        x -= share
+    return SOURCE_STATUSES[0][0]
+
+
+def synthetic_row(rng: random.Random, idx: int) -> Dict[str, str]:
+    title, author = synthetic_work(rng)
+    year = str(rng.randint(1800, 1910)) if rng.random() < 0.9 else ""
+    return {
+        "id": f"bench-s{idx // 10:05d}-i{idx % 10:02d}",
+        "title": title,
+        "author": author,
+        "material": rng.choice(MATERIALS),
+        "year_creation": year,
+        "period_creation": rng.choice(PERIODS),
+        "production_place": rng.choice(REGIONS),
+        "region": rng.choice(REGIONS),
+        "style": rng.choice(STYLES),
+        "course": rng.choice(COURSES),
+    }
+
+
+def build_workload(rows: int, page_pool: int, seed: int) -> Tuple[List[Tuple[str, str, str]], Workload]:
+    rng = random.Random(seed)
+    pages = [synthetic_page(rng, i) for i in range(page_pool)]
+    workload: Workload = []
+    for idx in range(rows):
+        row = synthetic_row(rng, idx)
+        n = rng.choice([0, 1, 2, 3, 4, 4, 5, 6])
+        picks = [(rng.randrange(page_pool), pick_status(rng)) for _ in range(n)]
+        task = bvw.RowTask(
+            global_idx=idx + 1,
+            row=row,
+            item_id=row["id"],
+            title=row["title"],
+            relevance_title=row["title"],
+            author=row["author"],
+            year_expr=bvw.normalize_year_expr(row["year_creation"], row["period_creation"]),
+            source_urls=[pages[i][2] for i, _ in picks],
+            fingerprint="",
+        )
+        workload.append((task, picks))
+    return pages, workload
+
+
+def fetch_result(page: Tuple[str, str, str], status: str) -> Dict[str, str]:
+    title, meta, url = page
+    if status.startswith("http_2"):
+        return {"status": status, "page_title": title, "meta_description": meta, "final_url": url}
+    return {"status": status, "final_url": url}
+
+
+def make_records(pages: List[Tuple[str, str, str]], picks: List[Tuple[int, str]]) -> List[bvw.SourceRecord]:
+    # Fresh records per row, as build_source_records returns them.
+    records = [bvw.source_record_from_result(pages[i][2], fetch_result(pages[i], status)) for i, status in picks]
+    return bvw.order_source_records(records)
+
+
+class StaticFetcher:
+    """Serves one row's synthetic fetch results in place of FetchCoordinator."""
+
+    def __init__(self, results: Dict[str, Dict[str, str]]) -> None:
+        self.results = results
+
+    def submit(self, url: str) -> Future:
+        fut: Future = Future()
+        fut.set_result(self.results[url])
+        return fut
+
+
+def early_exit_mismatches(pages: List[Tuple[str, str, str]], workload: Workload) -> List[str]:
+    """Ids of rows whose EARLY_EXIT_FIELDS differ between a fetch-all and an early-exit run."""
+    bad: List[str] = []
+    for task, picks in workload:
+        results: Dict[str, Dict[str, str]] = {}
+        for i, status in picks:
+            results.setdefault(pages[i][2], fetch_result(pages[i], status))
+        fetcher = StaticFetcher(results)
+        full = bvw.verify_row(task, bvw.build_source_records(task.source_urls, {}, fetcher))
+        early = bvw.verify_row(
+            task, bvw.build_source_records(task.source_urls, {}, fetcher, settled=lambda recs, t=task: bvw.row_is_settled(t, recs))
+        )
+        if any(full[f] != early[f] for f in EARLY_EXIT_FIELDS):
+            bad.append(task.item_id)
+    return bad
+
+
+def reset_caches() -> None:
+    bvw.work_tokens.cache_clear()
+    bvw.folded_haystack.cache_clear()
+
+
+def run_rows(pages: List[Tuple[str, str, str]], workload: Workload) -> List[Dict[str, str]]:
+    return [bvw.verify_row(task, make_records(pages, picks)) for task, picks in workload]
+
+
+def output_digests(outputs: List[Dict[str, str]]) -> Tuple[str, List[str]]:
+    total = hashlib.sha256()
+    chunks: List[str] = []
+    for start in range(0, len(outputs), GOLDEN_CHUNK):
+        h = hashlib.sha256()
+        for row in outputs[start : start + GOLDEN_CHUNK]:
+            data = json.dumps({k: v for k, v in row.items() if k != "input_fingerprint"}, ensure_ascii=False, sort_keys=True).encode("utf-8")
+            h.update(data + b"\n")
+            total.update(data + b"\n")
+        chunks.append(h.hexdigest()[:16])
+    return total.hexdigest(), chunks
+
+
+def measure_allocations(pages: List[Tuple[str, str, str]], workload: Workload) -> Dict[str, float]:
+    reset_caches()
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    outputs = run_rows(pages, workload)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    n = len(outputs)
+    return {
+        "alloc_rows": n,
+        "peak_kb": round((peak - before) / 1024, 1),
+        "retained_bytes_per_row": round((current - before) / n, 1) if n else 0.0,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", default=",".join(str(n) for n in DEFAULT_SCALES), help="comma-separated row counts")
+    parser.add_argument("--page-pool", type=int, default=5_000)
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--golden", type=Path, default=GOLDEN_JSON)
+    parser.add_argument("--update-golden", action="store_true", help="record the current outputs as the golden digests")
+    parser.add_argument("--out", type=Path, default=BENCH_DIR)
+    parser.add_argument("--no-alloc", action="store_true", help="skip the tracemalloc pass")
+    args = parser.parse_args()
+
+    scales = [int(s) for s in args.scales.split(",") if s.strip()]
+    golden = json.loads(args.golden.read_text(encoding="utf-8")) if args.golden.exists() and not args.update_golden else {}
+    if not golden and not args.update_golden:
+        print(f"No golden file at {args.golden}; outputs cannot be checked (record one with --update-golden).", file=sys.stderr)
+        return 1
+
+    results: Dict[str, Dict[str, object]] = {}
+    failed = False
+    for n in scales:
+        pages, workload = build_workload(n, args.page_pool, args.seed)
+        reset_caches()
+        gc.collect()
+        t0 = time.perf_counter()
+        outputs = run_rows(pages, workload)
+        elapsed = time.perf_counter() - t0
+
+        digest, chunks = output_digests(outputs)
+        statuses: Dict[str, int] = {}
+        for row in outputs:
+            statuses[row["status_detail"]] = statuses.get(row["status_detail"], 0) + 1
+        entry: Dict[str, object] = {
+            "rows": n,
+            "seconds": round(elapsed, 3),
+            "rows_per_s": round(n / elapsed, 1) if elapsed else 0.0,
+            "status_detail": dict(sorted(statuses.items())),
+            "digest": digest,
+            "chunks": chunks,
+        }
+        if not args.no_alloc:
+            entry.update(measure_allocations(pages, workload[:ALLOC_ROWS]))
+        early_bad = early_exit_mismatches(pages, workload)
+        entry["early_exit_mismatches"] = len(early_bad)
+        results[str(n)] = entry
+
+        line = f"rows={n:>7}  {elapsed:7.2f}s  {entry['rows_per_s']:>10,.0f} rows/s"
+        if not args.no_alloc:
+            line += f"  peak {entry['peak_kb']:,.0f} KB / {entry['alloc_rows']} rows  retained {entry['retained_bytes_per_row']:,.0f} B/row"
+        expected = golden.get("scales", {}).get(str(n)) if golden else None
+        if expected and (expected["seed"], expected["page_pool"]) == (args.seed, args.page_pool):
+            if expected["digest"] == digest:
+                line += "  golden ok"
+            else:
+                failed = True
+                bad = [i for i, (a, b) in enumerate(zip(expected["chunks"], chunks)) if a != b]
+                first = bad[0] * GOLDEN_CHUNK if bad else 0
+                line += f"  GOLDEN MISMATCH ({len(bad)} chunks differ, first at row {first})"
+        elif not args.update_golden:
+            failed = True
+            line += f"  NO GOLDEN for seed {args.seed}, page pool {args.page_pool}"
+        if early_bad:
+            failed = True
+            line += f"  EARLY EXIT CHANGES {len(early_bad)} rows (first {early_bad[0]})"
+        print(line)
+
+    args.out.mkdir(parents=True, exist_ok=True)
+    out_path = args.out / f"scoring-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    payload = {
+        "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "config": {"page_pool": args.page_pool, "seed": args.seed, "alloc_rows_max": ALLOC_ROWS},
+        "results": {k: {f: v for f, v in e.items() if f != "chunks"} for k, e in results.items()},
+    }
+    out_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    print(f"Wrote {out_path}")
+
+    if args.update_golden:
+        prior = json.loads(args.golden.read_text(encoding="utf-8")) if args.golden.exists() else {}
+        scales_out = prior.get("scales", {})
+        for key, entry in results.items():
+            scales_out[key] = {"seed": args.seed, "page_pool": args.page_pool, "digest": entry["digest"], "chunks": entry["chunks"]}
+        args.golden.parent.mkdir(parents=True, exist_ok=True)
+        args.golden.write_text(json.dumps({"scales": scales_out}, indent=2) + "\n", encoding="utf-8")
+        print(f"Wrote {args.golden}")
+    if failed:
+        print("Scoring check failed: golden digests missing or different, or early exit changed rows (see above).", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
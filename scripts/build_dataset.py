@@ -6,21 +6,26 @@ Outputs:
 - app/data/artworks.json metadata for frontend app
 """
 
+import argparse
 import csv
 import json
+import os
 import posixpath
 import re
+import subprocess
 import zipfile
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Sequence, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 import xml.etree.ElementTree as ET
 
 ROOT = Path(__file__).resolve().parents[1]
 APP_DIR = ROOT / "app"
 ASSETS_DIR = APP_DIR / "assets"
 DATA_DIR = APP_DIR / "data"
+# Reproducible-builds convention: a fixed build time, in seconds since the epoch.
+SOURCE_DATE_EPOCH_ENV = "SOURCE_DATE_EPOCH"
 
 DECKS = [
     {
@@ -223,6 +228,12 @@ AUTHOR_OBJECT_WORDS = {
     "knife",
 }
 
+# Name words are length-bounded: with an unbounded run, a long token with
+# internal word boundaries ("A.A.A...", "Ab-Ab-...") is rescanned from every
+# boundary and finditer goes quadratic. No real name word comes near the cap.
+AUTHOR_NAME_WORD = r"[A-Z][A-Za-z'’\-.]{1,40}"
+AUTHOR_PATTERN = re.compile(rf"\b({AUTHOR_NAME_WORD}(?:\s+(?:{AUTHOR_NAME_WORD}|de|van|von|da|del|du|la)){{1,6}})\s*,")
+ARTIST_PHRASE_PATTERN = re.compile(rf"\b({AUTHOR_NAME_WORD}(?:\s+{AUTHOR_NAME_WORD}){{0,2}}\s+artist)\b")
 AUTHOR_CONTEXT_HINTS = re.compile(
     r"\b(oil|wood|bronze|lithograph|porcelain|earthenware|chair|vase|mask|figure|throne|designed|painting|service|bowl|textile|cloth)\b",
     re.IGNORECASE,
@@ -1149,8 +1160,7 @@ def is_valid_author(name: str) -> bool:
 
 
 def extract_author(text: str) -> str:
-    pattern = r"\b([A-Z][A-Za-z'’\-.]+(?:\s+(?:[A-Z][A-Za-z'’\-.]+|de|van|von|da|del|du|la)){1,6})\s*,"
-    for match in re.finditer(pattern, text):
+    for match in AUTHOR_PATTERN.finditer(text):
         candidate = trim_author_candidate(match.group(1))
         if not is_valid_author(candidate):
             continue
@@ -1158,7 +1168,7 @@ def extract_author(text: str) -> str:
         if AUTHOR_CONTEXT_HINTS.search(tail):
             return candidate
 
-    artist_phrase = re.search(r"\b([A-Z][A-Za-z'’\-.]+(?:\s+[A-Z][A-Za-z'’\-.]+){0,2}\s+artist)\b", text)
+    artist_phrase = ARTIST_PHRASE_PATTERN.search(text)
     if artist_phrase:
         return clean_name(artist_phrase.group(1))
 
@@ -1528,70 +1538,118 @@ def build() -> Tuple[List[dict], dict]:
     return all_items, stats
 
 
-def write_comparison_table(items: List[dict]) -> Path:
-    out_path = DATA_DIR / "comparison_table.csv"
-    header = [
-        "id",
-        "course",
-        "slide",
-        "image_index",
-        "title",
-        "record_type",
-        "image_path",
-        "year_creation",
-        "period_creation",
-        "author",
-        "production_place",
-        "region",
-        "style",
-        "material",
-        "historical_background_zh",
-        "historical_background_en",
-        "historical_background_sources",
-        "study_description",
-        "raw_slide_text",
+COMPARISON_HEADER = [
+    "id",
+    "course",
+    "slide",
+    "image_index",
+    "title",
+    "record_type",
+    "image_path",
+    "year_creation",
+    "period_creation",
+    "author",
+    "production_place",
+    "region",
+    "style",
+    "material",
+    "historical_background_zh",
+    "historical_background_en",
+    "historical_background_sources",
+    "study_description",
+    "raw_slide_text",
+]
+
+
+def comparison_row(item: dict) -> List[str]:
+    meta = item.get("metadata", {})
+    return [
+        item.get("id", ""),
+        item.get("deckTitle", ""),
+        item.get("slideNumber", ""),
+        item.get("imageIndex", ""),
+        item.get("title", ""),
+        meta.get("recordType", ""),
+        item.get("image", ""),
+        meta.get("year", ""),
+        meta.get("period", ""),
+        meta.get("author", ""),
+        meta.get("productionPlace", ""),
+        meta.get("region", ""),
+        meta.get("style", ""),
+        meta.get("material", ""),
+        meta.get("historicalBackgroundZh", ""),
+        meta.get("historicalBackgroundEn", ""),
+        " | ".join(meta.get("historicalBackgroundSources", []) or []),
+        item.get("studyDescription", ""),
+        item.get("description", ""),
     ]
 
+
+def write_comparison_table(items: List[dict]) -> Path:
+    out_path = DATA_DIR / "comparison_table.csv"
     with out_path.open("w", encoding="utf-8-sig", newline="") as fp:
         writer = csv.writer(fp)
-        writer.writerow(header)
+        writer.writerow(COMPARISON_HEADER)
         for item in items:
-            meta = item.get("metadata", {})
-            writer.writerow(
-                [
-                    item.get("id", ""),
-                    item.get("deckTitle", ""),
-                    item.get("slideNumber", ""),
-                    item.get("imageIndex", ""),
-                    item.get("title", ""),
-                    meta.get("recordType", ""),
-                    item.get("image", ""),
-                    meta.get("year", ""),
-                    meta.get("period", ""),
-                    meta.get("author", ""),
-                    meta.get("productionPlace", ""),
-                    meta.get("region", ""),
-                    meta.get("style", ""),
-                    meta.get("material", ""),
-                    meta.get("historicalBackgroundZh", ""),
-                    meta.get("historicalBackgroundEn", ""),
-                    " | ".join(meta.get("historicalBackgroundSources", []) or []),
-                    item.get("studyDescription", ""),
-                    item.get("description", ""),
-                ]
-            )
+            writer.writerow(comparison_row(item))
     return out_path
 
 
-def main() -> None:
-    items, stats = build()
-    payload = {
-        "generatedAt": datetime.now(timezone.utc).isoformat(),
+def reproducible_mode(requested: bool = False) -> bool:
+    return requested or bool(os.environ.get(SOURCE_DATE_EPOCH_ENV))
+
+
+def last_commit_time(paths: List[Path]) -> Optional[int]:
+    """Commit time of the last git commit touching any of the tracked paths."""
+    tracked = [str(p.relative_to(ROOT)) for p in paths if p.is_relative_to(ROOT)]
+    if not tracked:
+        return None
+    try:
+        out = subprocess.run(
+            ["git", "log", "-1", "--format=%ct", "--", *tracked], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return int(out) if out else None
+
+
+def generated_at(inputs: List[Path], reproducible: bool = False) -> str:
+    """Timestamp for generated artifacts. In reproducible mode it is
+    SOURCE_DATE_EPOCH, or else the last git commit time of the tracked
+    inputs; file mtimes are never used, since every clone or cache restore
+    changes them."""
+    if not reproducible:
+        return datetime.now(timezone.utc).isoformat()
+    epoch = os.environ.get(SOURCE_DATE_EPOCH_ENV)
+    ts = int(epoch) if epoch else last_commit_time(inputs)
+    if ts is None:
+        raise SystemExit(f"Reproducible mode needs {SOURCE_DATE_EPOCH_ENV} (no git history for {', '.join(str(p) for p in inputs)})")
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat()
+
+
+def build_payload(items: List[dict], stats: dict, reproducible: bool = False) -> dict:
+    return {
+        # The decks are not in git; the rule tables in this file are the tracked input.
+        "generatedAt": generated_at([Path(__file__).resolve()], reproducible),
         "count": len(items),
         "items": items,
         "decks": [{k: v for k, v in d.items() if k != "source"} for d in DECKS],
         "stats": stats,
     }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build study dataset from PPTX files.")
+    parser.add_argument(
+        "--reproducible",
+        action="store_true",
+        help=f"take generatedAt from {SOURCE_DATE_EPOCH_ENV} or the last commit of this script instead of the clock (also on when {SOURCE_DATE_EPOCH_ENV} is set)",
+    )
+    args = parser.parse_args()
+
+    items, stats = build()
+    payload = build_payload(items, stats, reproducible_mode(args.reproducible))
     out_path = DATA_DIR / "artworks.json"
     out_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
     table_path = write_comparison_table(items)
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""Indexed, lazily loaded views of the pipeline's catalogs.
+
+artworks_catalog() wraps app/data/artworks.json and works_catalog() wraps
+works.csv. Each file is read once, on first access. Lookup by id is a
+dict hit, and secondary indexes (deck, slide, record type, region, style
+for artworks; status and status detail for works) are built the first time
+they are queried. Artwork catalogs also memoize each item's effective
+metadata: the normalized fields the web app shows before any browser-side
+overrides (see getEffectiveItem in app/app.js).
+
+Usage:
+    python3 scripts/catalog.py africa-s014-i02
+    python3 scripts/catalog.py --where style "Art Nouveau"
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+
+ROOT = Path(__file__).resolve().parents[1]
+ARTWORKS_JSON = ROOT / "app" / "data" / "artworks.json"
+WORKS_CSV = ROOT / "works.csv"
+
+Record = Dict[str, object]
+
+ARTWORK_INDEXES: Dict[str, Callable[[Record], object]] = {
+    "deck": lambda item: item.get("deckId", ""),
+    "slide": lambda item: (item.get("deckId", ""), item.get("slideNumber")),
+    "record_type": lambda item: (item.get("metadata") or {}).get("recordType", ""),
+    "region": lambda item: (item.get("metadata") or {}).get("region", ""),
+    "style": lambda item: (item.get("metadata") or {}).get("style", ""),
+}
+WORKS_INDEXES: Dict[str, Callable[[Record], object]] = {
+    "status": lambda row: row.get("status", ""),
+    "status_detail": lambda row: row.get("status_detail", ""),
+}
+
+
+class Catalog:
+    """Records keyed by "id", loaded on first use, with lazily built secondary indexes."""
+
+    def __init__(self, loader: Callable[[], Tuple[object, List[Record]]], indexes: Dict[str, Callable[[Record], object]]) -> None:
+        self._loader = loader
+        self._index_keys = indexes
+        self._lock = threading.Lock()
+        self._document: object = None
+        self._records: Optional[List[Record]] = None
+        self._by_id: Dict[str, Record] = {}
+        self._indexes: Dict[str, Dict[object, List[Record]]] = {}
+        self._effective: Dict[str, Dict[str, object]] = {}
+
+    @classmethod
+    def of(cls, records: List[Record], indexes: Optional[Dict[str, Callable[[Record], object]]] = None) -> "Catalog":
+        """A catalog over records already in memory."""
+        return cls(lambda: (None, records), indexes or {})
+
+    def _load(self) -> List[Record]:
+        if self._records is None:
+            with self._lock:
+                if self._records is None:
+                    document, records = self._loader()
+                    self._by_id = {r["id"]: r for r in records if r.get("id")}
+                    self._document = document
+                    self._records = records
+        return self._records
+
+    @property
+    def document(self) -> object:
+        """The parsed file the records came from (artworks.json payload); writers modify and save it."""
+        self._load()
+        return self._document
+
+    def __iter__(self) -> Iterator[Record]:
+        return iter(self._load())
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def __contains__(self, item_id: object) -> bool:
+        self._load()
+        return item_id in self._by_id
+
+    def get(self, item_id: Optional[str], default: Optional[Record] = None) -> Optional[Record]:
+        self._load()
+        return self._by_id.get(item_id, default)
+
+    def index(self, name: str) -> Dict[object, List[Record]]:
+        if name not in self._indexes:
+            key = self._index_keys[name]
+            records = self._load()
+            with self._lock:
+                built: Dict[object, List[Record]] = {}
+                for r in records:
+                    built.setdefault(key(r), []).append(r)
+                self._indexes[name] = built
+        return self._indexes[name]
+
+    def where(self, name: str, value: object) -> List[Record]:
+        return self.index(name).get(value, [])
+
+    def effective_metadata(self, item_id: str) -> Optional[Dict[str, object]]:
+        meta = self._effective.get(item_id)
+        if meta is None:
+            item = self.get(item_id)
+            if item is None:
+                return None
+            meta = self._effective[item_id] = effective_metadata(item)
+        return meta
+
+
+def _text(value: object) -> str:
+    return str(value or "").strip()
+
+
+def effective_metadata(item: Record) -> Dict[str, object]:
+    base = item.get("metadata") or {}
+    region = _text(base.get("region"))
+    production_place = _text(base.get("productionPlace") if base.get("productionPlace") is not None else base.get("region"))
+    author = _text(base.get("author")) or f"{production_place or region or 'Unknown place'} artist"
+    zh = _text(base.get("historicalBackgroundZh"))
+    en = _text(base.get("historicalBackgroundEn"))
+    sources = base.get("historicalBackgroundSources")
+    return {
+        "year": _text(base.get("year")),
+        "period": _text(base.get("period")),
+        "author": author,
+        "productionPlace": production_place,
+        "region": region,
+        "style": _text(base.get("style")),
+        "material": _text(base.get("material")),
+        "recordType": _text(base.get("recordType") or "artwork"),
+        "historicalBackground": "\n".join(t for t in (zh, en) if t),
+        "historicalBackgroundZh": zh,
+        "historicalBackgroundEn": en,
+        "historicalBackgroundSources": sources if isinstance(sources, list) else [],
+    }
+
+
+def artworks_catalog(path: Path = ARTWORKS_JSON) -> Catalog:
+    def load() -> Tuple[object, List[Record]]:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return data, data.get("items", [])
+
+    return Catalog(load, ARTWORK_INDEXES)
+
+
+def works_catalog(path: Path = WORKS_CSV) -> Catalog:
+    def load() -> Tuple[object, List[Record]]:
+        if not path.exists():
+            return None, []
+        with path.open(encoding="utf-8-sig", newline="") as f:
+            return None, list(csv.DictReader(f))
+
+    return Catalog(load, WORKS_INDEXES)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("ids", nargs="*", help="item ids to show")
+    parser.add_argument("--where", nargs=2, metavar=("INDEX", "VALUE"), help=f"list ids by {', '.join(ARTWORK_INDEXES)}")
+    parser.add_argument("--artworks", type=Path, default=ARTWORKS_JSON)
+    parser.add_argument("--works", type=Path, default=WORKS_CSV)
+    args = parser.parse_args()
+
+    if not args.artworks.exists():
+        print(f"Missing input: {args.artworks}", file=sys.stderr)
+        return 1
+    artworks = artworks_catalog(args.artworks)
+    works = works_catalog(args.works)
+    if args.where:
+        name, value = args.where
+        if name not in ARTWORK_INDEXES:
+            print(f"Unknown index: {name}", file=sys.stderr)
+            return 1
+        key: object = value
+        if name == "slide":
+            deck, _, number = value.partition(":")
+            key = (deck, int(number) if number.isdigit() else number)
+        for item in artworks.where(name, key):
+            print(f"{item['id']}\t{item.get('title', '')}")
+    for item_id in args.ids:
+        if item_id not in artworks:
+            print(f"{item_id}: not found", file=sys.stderr)
+            continue
+        row = works.get(item_id) or {}
+        print(json.dumps({"id": item_id, "metadata": artworks.effective_metadata(item_id), "works_status": row.get("status", "")}, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""Check iter_row_tasks' scoped dedupe against whole-table dedupe.
+
+iter_row_tasks only remembers image paths for the current image directory
+and titles for the current slide. On input grouped by slide and directory
+(as build_dataset.py writes it) that must keep exactly the rows a dedupe
+over the whole table keeps; on interleaved input it must raise rather than
+keep different rows. Runs on synthetic decks and, when present, on
+app/data/comparison_table.csv. No network.
+
+Usage:
+    python3 scripts/check_row_grouping.py
+    python3 scripts/check_row_grouping.py --decks 20 --seed 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+from typing import Dict, List
+
+import build_verified_works as bvw
+
+
+DECKS = 6
+SLIDES_PER_DECK = 40
+INTERLEAVED_CASES = 50
+TITLES = ["Chair", "Vase", "Brooch", "Tapestry", "Lamp", "Mask", "Cabinet", "Ewer"]
+
+
+def whole_table_ids(rows: List[Dict[str, str]]) -> List[str]:
+    """Ids kept by dedupe over every row seen so far (the unscoped rule)."""
+    seen_image_paths: set[str] = set()
+    seen_slide_object_keys: set[tuple[str, str, str]] = set()
+    ids: List[str] = []
+    for global_idx, row in enumerate(rows, start=1):
+        if row.get("record_type") != "artwork" or global_idx in bvw.SKIP_GLOBAL_INDEX_RANGE:
+            continue
+        image_path = (row.get("image_path") or "").strip()
+        course = (row.get("course") or "").strip()
+        slide = str(row.get("slide") or "").strip()
+        title_for_dedupe = bvw.normalize_dedupe_title(row.get("title", ""))
+        if image_path and image_path in seen_image_paths:
+            continue
+        if title_for_dedupe:
+            key = (course, slide, title_for_dedupe)
+            if key in seen_slide_object_keys:
+                continue
+            seen_slide_object_keys.add(key)
+        if image_path:
+            seen_image_paths.add(image_path)
+        ids.append(row["id"])
+    return ids
+
+
+def scoped_ids(rows: List[Dict[str, str]]) -> List[str]:
+    return [t.item_id for t in bvw.iter_row_tasks(rows)]
+
+
+def synthetic_rows(rng: random.Random, decks: int) -> List[Dict[str, str]]:
+    """Grouped rows with repeated images across slides, detail views within a
+    slide, titles repeated on other slides, rows without images and slide
+    headers."""
+    rows: List[Dict[str, str]] = []
+    for d in range(decks):
+        course = f"course_{d}"
+        used_images: List[str] = []
+        for slide in range(1, SLIDES_PER_DECK + 1):
+            rows.append({"id": f"{course}-{slide}-h", "record_type": "slide", "course": course, "slide": str(slide)})
+            for k in range(rng.randint(1, 4)):
+                title = rng.choice(TITLES) + rng.choice(["", "", " (detail)", " Detail"])
+                if used_images and rng.random() < 0.2:
+                    image_path = rng.choice(used_images)
+                elif rng.random() < 0.1:
+                    image_path = ""
+                else:
+                    image_path = f"assets/{course}/s{slide}_{k}.jpg"
+                    used_images.append(image_path)
+                rows.append({
+                    "id": f"{course}-{slide}-{k}",
+                    "record_type": "artwork",
+                    "course": course,
+                    "slide": str(slide),
+                    "title": title,
+                    "image_path": image_path,
+                })
+    return rows
+
+
+def interleaved(rng: random.Random, rows: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    """Merge two decks row by row, or move one slide's rows past a later slide."""
+    courses = sorted({r["course"] for r in rows})
+    if len(courses) > 1 and rng.random() < 0.5:
+        a, b = rng.sample(courses, 2)
+        first = [r for r in rows if r["course"] == a]
+        second = [r for r in rows if r["course"] == b]
+        merged = [r for pair in zip(first, second) for r in pair]
+        return merged + first[len(second):] + second[len(first):]
+    artworks = [r for r in rows if r["record_type"] == "artwork"]
+    moved = rng.choice(artworks)
+    later = [r for r in artworks if r["course"] == moved["course"] and int(r["slide"]) > int(moved["slide"]) + 1]
+    if not later:
+        return interleaved(rng, rows)
+    out = [r for r in rows if r is not moved]
+    out.insert(out.index(rng.choice(later)) + 1, moved)
+    return out
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--decks", type=int, default=DECKS)
+    parser.add_argument("--cases", type=int, default=INTERLEAVED_CASES, help="interleaved inputs to try")
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    failures: List[str] = []
+
+    rows = synthetic_rows(rng, args.decks)
+    expected = whole_table_ids(rows)
+    got = scoped_ids(rows)
+    print(f"grouped synthetic: {len(got)} of {sum(r['record_type'] == 'artwork' for r in rows)} rows kept")
+    if got != expected:
+        failures.append(f"grouped synthetic rows: kept {len(got)}, whole-table dedupe keeps {len(expected)}")
+
+    if bvw.INPUT_CSV.exists():
+        table = list(bvw.load_rows())
+        expected, got = whole_table_ids(table), scoped_ids(table)
+        print(f"{bvw.INPUT_CSV.name}: {len(got)} rows kept")
+        if got != expected:
+            failures.append(f"{bvw.INPUT_CSV.name}: kept {len(got)}, whole-table dedupe keeps {len(expected)}")
+
+    # A reordering that only touches skipped rows changes nothing and may pass.
+    raised = 0
+    for i in range(args.cases):
+        shuffled = interleaved(rng, rows)
+        try:
+            got = scoped_ids(shuffled)
+        except ValueError:
+            raised += 1
+            continue
+        if got != whole_table_ids(shuffled):
+            failures.append(f"interleaved case #{i} (seed {args.seed}) was accepted with different rows kept")
+    print(f"interleaved: {raised} of {args.cases} rejected")
+    if args.cases and not raised:
+        failures.append("no interleaved case was rejected")
+
+    if failures:
+        print(f"\n{len(failures)} failed:", file=sys.stderr)
+        for line in failures:
+            print(f"  {line}", file=sys.stderr)
+        return 1
+    print("\nScoped dedupe matches whole-table dedupe on grouped input and rejects interleaved input.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""Pluggable HTTP transport for the source verifier.
+
+Modes:
+- live: plain urllib requests (default)
+- record: live requests whose raw status, headers and body are stored in a
+  fixture directory, one JSON file per URL
+- replay: responses served from the fixture directory only (no network)
+- standin: requests routed to a local stand-in server (see `serve` below)
+
+The stand-in server serves recorded fixtures over HTTP with configurable
+latency and status overrides:
+
+    python3 scripts/fetch_transport.py serve --fixtures screen_results/fixtures --port 8765 --latency-ms 150
+    python3 scripts/build_verified_works.py --transport standin --standin-url http://127.0.0.1:8765
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import hashlib
+import io
+import json
+import random
+import ssl
+import sys
+import threading
+import time
+from http.client import HTTPMessage
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.error import HTTPError, URLError
+from urllib.parse import parse_qs, quote, urlparse
+from urllib.request import Request, urlopen
+
+
+ROOT = Path(__file__).resolve().parents[1]
+FIXTURES_DIR = ROOT / "screen_results" / "fixtures"
+
+TRANSPORT_MODES = ["live", "record", "replay", "standin"]
+RECORD_MAX_BYTES = 2_000_000
+STANDIN_FINAL_URL_HEADER = "X-Standin-Final-URL"
+# Hop-by-hop / length headers are recomputed when a fixture is served again.
+SKIPPED_REPLAY_HEADERS = {"transfer-encoding", "connection", "content-length", "content-encoding"}
+
+
+def fixture_key(url: str) -> str:
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()[:24]
+
+
+def make_headers(pairs: List[Tuple[str, str]]) -> HTTPMessage:
+    msg = HTTPMessage()
+    for k, v in pairs:
+        msg[k] = v
+    return msg
+
+
+class FixtureResponse:
+    """Minimal stand-in for http.client.HTTPResponse as used by the verifier."""
+
+    def __init__(self, url: str, status: int, headers: HTTPMessage, body: bytes) -> None:
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self._body = io.BytesIO(body)
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        return self._body.read() if amt is None or amt < 0 else self._body.read(amt)
+
+    def geturl(self) -> str:
+        return self.url
+
+    def close(self) -> None:
+        self._body.close()
+
+    def __enter__(self) -> "FixtureResponse":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class FixtureStore:
+    def __init__(self, root: Path = FIXTURES_DIR) -> None:
+        self.root = root
+        self._lock = threading.Lock()
+
+    def path_for(self, url: str) -> Path:
+        return self.root / f"{fixture_key(url)}.json"
+
+    def load(self, url: str) -> Optional[Dict]:
+        path = self.path_for(url)
+        if not path.exists():
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def save(self, url: str, fixture: Dict) -> None:
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            self.path_for(url).write_text(json.dumps(fixture, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    def urls(self) -> List[str]:
+        if not self.root.exists():
+            return []
+        return sorted(json.loads(p.read_text(encoding="utf-8")).get("url", "") for p in self.root.glob("*.json"))
+
+
+def fixture_body(fixture: Dict) -> bytes:
+    return base64.b64decode(fixture.get("body_b64") or "")
+
+
+def response_from_fixture(req: Request, fixture: Dict):
+    """Build a response (or raise the recorded error) from a stored fixture."""
+    url = req.full_url
+    if fixture.get("error"):
+        raise URLError(fixture.get("reason") or fixture["error"])
+    headers = make_headers([(k, v) for k, v in fixture.get("headers", []) if k.lower() not in SKIPPED_REPLAY_HEADERS])
+    status = int(fixture.get("status") or 200)
+    etag = headers.get("ETag")
+    if status < 300 and etag and req.get_header("If-none-match") == etag:
+        raise HTTPError(url, 304, "Not Modified", headers, io.BytesIO(b""))
+    if status >= 400:
+        raise HTTPError(url, status, fixture.get("reason") or "", headers, io.BytesIO(fixture_body(fixture)))
+    return FixtureResponse(fixture.get("final_url") or url, status, headers, fixture_body(fixture))
+
+
+class LiveTransport:
+    mode = "live"
+
+    def open(self, req: Request, timeout: float):
+        return urlopen(req, timeout=timeout, context=ssl.create_default_context())
+
+
+class RecordTransport(LiveTransport):
+    mode = "record"
+
+    def __init__(self, store: FixtureStore) -> None:
+        self.store = store
+
+    def open(self, req: Request, timeout: float):
+        url = req.full_url
+        try:
+            with super().open(req, timeout) as resp:
+                body = resp.read(RECORD_MAX_BYTES)
+                fixture = {
+                    "url": url,
+                    "status": getattr(resp, "status", 200),
+                    "reason": getattr(resp, "reason", ""),
+                    "headers": list(resp.headers.items()),
+                    "final_url": resp.geturl(),
+                    "body_b64": base64.b64encode(body).decode("ascii"),
+                    "recorded_at": time.time(),
+                }
+        except HTTPError as e:
+            if e.code == 304:
+                raise
+            body = e.read() if e.fp else b""
+            fixture = {
+                "url": url,
+                "status": e.code,
+                "reason": str(e.reason),
+                "headers": list(e.headers.items()) if e.headers else [],
+                "final_url": url,
+                "body_b64": base64.b64encode(body[:RECORD_MAX_BYTES]).decode("ascii"),
+                "recorded_at": time.time(),
+            }
+        except URLError as e:
+            fixture = {"url": url, "error": "url_error", "reason": str(getattr(e, "reason", "unknown")), "recorded_at": time.time()}
+        self.store.save(url, fixture)
+        return response_from_fixture(req, fixture)
+
+
+class ReplayTransport:
+    mode = "replay"
+
+    def __init__(self, store: FixtureStore) -> None:
+        self.store = store
+
+    def open(self, req: Request, timeout: float):
+        fixture = self.store.load(req.full_url)
+        if fixture is None:
+            raise URLError("replay miss")
+        return response_from_fixture(req, fixture)
+
+
+class RoutedResponse:
+    """Response from the stand-in server that reports the original source URL."""
+
+    def __init__(self, resp, url: str) -> None:
+        self._resp = resp
+        self.status = resp.status
+        self.headers = resp.headers
+        self.url = resp.headers.get(STANDIN_FINAL_URL_HEADER) or url
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        return self._resp.read(amt)
+
+    def geturl(self) -> str:
+        return self.url
+
+    def close(self) -> None:
+        self._resp.close()
+
+    def __enter__(self) -> "RoutedResponse":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class StandinTransport:
+    mode = "standin"
+
+    def __init__(self, base_url: str) -> None:
+        self.base_url = base_url.rstrip("/")
+
+    def open(self, req: Request, timeout: float):
+        url = req.full_url
+        routed = Request(f"{self.base_url}/fetch?url={quote(url, safe='')}", headers=dict(req.header_items()))
+        return RoutedResponse(urlopen(routed, timeout=timeout), url)
+
+
+def make_transport(mode: str, fixtures_dir: Path = FIXTURES_DIR, standin_url: str = ""):
+    if mode == "live":
+        return LiveTransport()
+    if mode == "record":
+        return RecordTransport(FixtureStore(fixtures_dir))
+    if mode == "replay":
+        return ReplayTransport(FixtureStore(fixtures_dir))
+    if mode == "standin":
+        if not standin_url:
+            raise ValueError("standin transport needs a server URL")
+        return StandinTransport(standin_url)
+    raise ValueError(f"unknown transport mode: {mode}")
+
+
+class StandinConfig:
+    def __init__(self, store: FixtureStore, latency_ms: float = 0.0, jitter_ms: float = 0.0, status_overrides: Optional[List[Tuple[str, int]]] = None, seed: int = 0) -> None:
+        self.store = store
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.status_overrides = status_overrides or []
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def delay(self) -> float:
+        with self.lock:
+            jitter = self.rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        return max(0.0, self.latency_ms + jitter) / 1000.0
+
+    def status_override(self, url: str) -> Optional[int]:
+        for pattern, code in self.status_overrides:
+            if pattern in url:
+                return code
+        return None
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    config: StandinConfig
+
+    def log_message(self, fmt: str, *args) -> None:
+        pass
+
+    def send_fixture(self, url: str, status: int, headers: List[Tuple[str, str]], body: bytes, final_url: str) -> None:
+        self.send_response(status)
+        for k, v in headers:
+            if k.lower() not in SKIPPED_REPLAY_HEADERS:
+                self.send_header(k, v)
+        self.send_header(STANDIN_FINAL_URL_HEADER, final_url or url)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        parsed = urlparse(self.path)
+        url = (parse_qs(parsed.query).get("url") or [""])[0]
+        if parsed.path != "/fetch" or not url:
+            self.send_fixture(url, 400, [], b"expected /fetch?url=<source url>", url)
+            return
+        time.sleep(self.config.delay())
+        override = self.config.status_override(url)
+        fixture = self.config.store.load(url)
+        if override is not None:
+            self.send_fixture(url, override, [("Content-Type", "text/html")], b"", url)
+            return
+        if fixture is None or fixture.get("error"):
+            self.send_fixture(url, 502, [], b"no fixture", url)
+            return
+        headers = [(k, v) for k, v in fixture.get("headers", [])]
+        etag = dict((k.lower(), v) for k, v in headers).get("etag")
+        status = int(fixture.get("status") or 200)
+        if status < 300 and etag and self.headers.get("If-None-Match") == etag:
+            self.send_fixture(url, 304, [("ETag", etag)], b"", fixture.get("final_url") or url)
+            return
+        self.send_fixture(url, status, headers, fixture_body(fixture), fixture.get("final_url") or url)
+
+
+def start_standin_server(config: StandinConfig, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    handler = type("ConfiguredStandinHandler", (StandinHandler,), {"config": config})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def parse_status_override(raw: str) -> Tuple[str, int]:
+    pattern, _, code = raw.rpartition("=")
+    if not pattern or not code.isdigit():
+        raise argparse.ArgumentTypeError(f"expected URL_SUBSTRING=CODE, got {raw!r}")
+    return pattern, int(code)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Fixture tools for the source verifier transport.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve = sub.add_parser("serve", help="run the local stand-in server over a fixture directory")
+    serve.add_argument("--fixtures", type=Path, default=FIXTURES_DIR)
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--latency-ms", type=float, default=0.0)
+    serve.add_argument("--jitter-ms", type=float, default=0.0)
+    serve.add_argument("--status", type=parse_status_override, action="append", default=[], metavar="URL_SUBSTRING=CODE")
+    serve.add_argument("--seed", type=int, default=0)
+
+    listing = sub.add_parser("list", help="list recorded fixture URLs")
+    listing.add_argument("--fixtures", type=Path, default=FIXTURES_DIR)
+
+    args = parser.parse_args(argv)
+    store = FixtureStore(args.fixtures)
+    if args.command == "list":
+        for url in store.urls():
+            print(url)
+        return 0
+
+    config = StandinConfig(store, args.latency_ms, args.jitter_ms, args.status, args.seed)
+    server = start_standin_server(config, args.host, args.port)
+    print(f"Serving {len(store.urls())} fixtures from {args.fixtures} on http://{args.host}:{server.server_address[1]}", file=sys.stderr)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""Per-host adaptive timeouts and hedged requests for the source verifier.
+
+HostLatencyTracker keeps a window of recent time-to-first-byte samples per
+host; a request that timed out counts as a sample at its timeout, so a host
+that starts hanging pushes its estimate up rather than dropping out of it. Once a host has enough samples its request timeout becomes a multiple
+of its p99 (clamped to [MIN_TIMEOUT, the verifier's TIMEOUT]), and its p95
+is the point after which a hedged second request may be sent. HedgeBudget
+caps hedges at a fraction of all requests so a slow host cannot double the
+load on itself.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Deque, Dict, Optional
+from urllib.error import URLError
+
+from run_metrics import percentile
+
+
+SAMPLE_WINDOW = 200
+MIN_SAMPLES = 8
+TIMEOUT_P99_MULTIPLIER = 3.0
+MIN_TIMEOUT = 3.0
+# Never hedge sooner than this, even for very fast hosts.
+MIN_HEDGE_DELAY = 0.05
+HEDGE_MAX_FRACTION = 0.05
+HEDGE_BURST = 3.0
+HEDGE_WORKERS = 16
+
+
+def is_timeout(exc: BaseException) -> bool:
+    """True for a socket timeout, raw or wrapped in URLError (replayed ones carry only the text)."""
+    if isinstance(exc, URLError):
+        reason = exc.reason
+        return isinstance(reason, TimeoutError) or "timed out" in str(reason)
+    return isinstance(exc, TimeoutError)
+
+
+class HostLatencyTracker:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.samples: Dict[str, Deque[float]] = {}
+
+    def record(self, host: str, seconds: float) -> None:
+        with self.lock:
+            window = self.samples.get(host)
+            if window is None:
+                window = self.samples[host] = deque(maxlen=SAMPLE_WINDOW)
+            window.append(seconds)
+
+    def _percentile(self, host: str, pct: float) -> Optional[float]:
+        with self.lock:
+            window = self.samples.get(host)
+            if not window or len(window) < MIN_SAMPLES:
+                return None
+            values = sorted(window)
+        return percentile(values, pct)
+
+    def timeout_for(self, host: str, default: float) -> float:
+        p99 = self._percentile(host, 99)
+        if p99 is None:
+            return default
+        return max(MIN_TIMEOUT, min(default, p99 * TIMEOUT_P99_MULTIPLIER))
+
+    def hedge_delay(self, host: str) -> Optional[float]:
+        p95 = self._percentile(host, 95)
+        return None if p95 is None else max(MIN_HEDGE_DELAY, p95)
+
+
+class HedgeBudget:
+    """Token bucket: every primary request earns max_fraction of a hedge."""
+
+    def __init__(self, max_fraction: float = HEDGE_MAX_FRACTION, burst: float = HEDGE_BURST) -> None:
+        self.lock = threading.Lock()
+        self.max_fraction = max_fraction
+        self.burst = burst
+        self.tokens = burst
+
+    def earn(self) -> None:
+        with self.lock:
+            self.tokens = min(self.burst, self.tokens + self.max_fraction)
+
+    def try_spend(self) -> bool:
+        with self.lock:
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                return True
+            return False
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def hedge_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix="hedge")
+        return _executor
+
+
+def _close_quietly(fut: Future) -> None:
+    if fut.cancelled() or fut.exception() is not None:
+        return
+    try:
+        fut.result().close()
+    except Exception:
+        pass
+
+
+def hedged_call(attempt: Callable[[], object], delay: float, budget: HedgeBudget, on_hedge: Callable[[bool], None]):
+    """Run attempt(); if it has not returned after delay and the budget allows,
+    start a second attempt and return whichever succeeds first. The losing
+    response is closed when it arrives. on_hedge(won) reports each hedge."""
+    ex = hedge_executor()
+    primary = ex.submit(attempt)
+    done, _ = wait([primary], timeout=delay)
+    if done or not budget.try_spend():
+        return primary.result()
+
+    backup = ex.submit(attempt)
+    pending = {primary, backup}
+    first_error: Optional[BaseException] = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for fut in done:
+            if fut.exception() is None:
+                for other in (done | pending) - {fut}:
+                    other.add_done_callback(_close_quietly)
+                on_hedge(fut is backup)
+                return fut.result()
+            first_error = first_error or fut.exception()
+    on_hedge(False)
+    raise first_error
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Offline index of The Met's open-access object dump.
+
+Builds a compact SQLite lookup keyed by Met object id from MetObjects.csv
+(https://github.com/metmuseum/openaccess), so build_verified_works.py can
+resolve metmuseum.org/art/collection/search/<id> URLs without any network.
+
+Usage:
+    python3 scripts/met_index.py path/to/MetObjects.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+
+ROOT = Path(__file__).resolve().parents[1]
+MET_INDEX_DB = ROOT / "screen_results" / "met_objects.sqlite3"
+
+# MetObjects.csv column -> index column, in table order after object_id.
+DUMP_COLUMNS = [
+    ("Title", "title"),
+    ("Artist Display Name", "artist"),
+    ("Object Name", "object_name"),
+    ("Culture", "culture"),
+    ("Period", "period"),
+    ("Object Date", "object_date"),
+]
+RECORD_FIELDS = [field for _, field in DUMP_COLUMNS]
+BATCH_SIZE = 5000
+
+
+def build_index(dump_csv: Path, db_path: Path = MET_INDEX_DB) -> int:
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = db_path.with_suffix(db_path.suffix + ".tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+
+    conn = sqlite3.connect(tmp_path)
+    conn.execute(
+        "CREATE TABLE objects ("
+        "object_id INTEGER PRIMARY KEY, title TEXT, artist TEXT, object_name TEXT, "
+        "culture TEXT, period TEXT, object_date TEXT)"
+    )
+    count = 0
+    batch = []
+    # The dump is occasionally published with a BOM; the extra columns are ignored.
+    with dump_csv.open(encoding="utf-8-sig", newline="") as f:
+        for row in csv.DictReader(f):
+            raw_id = (row.get("Object ID") or "").strip()
+            if not raw_id.isdigit():
+                continue
+            batch.append([int(raw_id), *[(row.get(col) or "").strip() for col, _ in DUMP_COLUMNS]])
+            if len(batch) >= BATCH_SIZE:
+                conn.executemany("INSERT OR REPLACE INTO objects VALUES (?, ?, ?, ?, ?, ?, ?)", batch)
+                count += len(batch)
+                batch = []
+    if batch:
+        conn.executemany("INSERT OR REPLACE INTO objects VALUES (?, ?, ?, ?, ?, ?, ?)", batch)
+        count += len(batch)
+    conn.commit()
+    conn.execute("VACUUM")
+    conn.close()
+    tmp_path.replace(db_path)
+    return count
+
+
+class MetIndex:
+    """Read-only, thread-safe lookup over an index built by build_index()."""
+
+    def __init__(self, db_path: Path = MET_INDEX_DB) -> None:
+        self.db_path = db_path
+        self._local = threading.local()
+
+    def available(self) -> bool:
+        return self.db_path.exists()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+            self._local.conn = conn
+        return conn
+
+    def lookup(self, object_id: str) -> Optional[Dict[str, str]]:
+        if not object_id.isdigit() or not self.available():
+            return None
+        row = self._conn().execute(
+            f"SELECT {', '.join(RECORD_FIELDS)} FROM objects WHERE object_id = ?", (int(object_id),)
+        ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(RECORD_FIELDS, row))
+
+    def iter_records(self) -> Iterator[Dict[str, str]]:
+        if not self.available():
+            return
+        cur = self._conn().execute(f"SELECT object_id, {', '.join(RECORD_FIELDS)} FROM objects")
+        for row in cur:
+            yield dict(zip(["object_id", *RECORD_FIELDS], [str(row[0]), *row[1:]]))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("dump_csv", type=Path, help="MetObjects.csv from the Met open-access repository")
+    parser.add_argument("--out", type=Path, default=MET_INDEX_DB, help=f"index path (default: {MET_INDEX_DB})")
+    args = parser.parse_args()
+
+    if not args.dump_csv.exists():
+        print(f"Missing input: {args.dump_csv}", file=sys.stderr)
+        return 1
+    count = build_index(args.dump_csv, args.out)
+    print(f"Indexed {count} Met objects -> {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
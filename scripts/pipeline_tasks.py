@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""Make-like task graph over the data pipeline scripts.
+
+Each task declares the files it reads (data, decks, and the scripts and
+helper modules whose code and rule tables it runs) and the files it writes.
+A task runs only when the content fingerprint of its inputs differs from the
+one recorded after its last successful run, or an output is missing.
+Independent tasks (the Met index and the deck build) run in parallel.
+
+sync rewrites build's outputs in place, which the verifier reads, so the
+graph is re-walked until nothing is stale (verification is incremental, so
+the extra pass only re-checks rows whose input fingerprint changed).
+Network state such as the title cache is not an input; use --force verify
+to re-verify regardless.
+
+Usage:
+    python3 scripts/pipeline_tasks.py              # bring everything up to date
+    python3 scripts/pipeline_tasks.py --dry-run    # show what would run and why
+    python3 scripts/pipeline_tasks.py verify --force verify --verify-args "--transport replay"
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import shlex
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+import build_dataset
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPTS = ROOT / "scripts"
+TASK_STATE_JSON = ROOT / "screen_results" / "task_state.json"
+ARTWORKS_JSON = ROOT / "app" / "data" / "artworks.json"
+COMPARISON_CSV = ROOT / "app" / "data" / "comparison_table.csv"
+WORKS_CSV = ROOT / "works.csv"
+REPORT_MD = ROOT / "report.md"
+MET_INDEX_DB = ROOT / "screen_results" / "met_objects.sqlite3"
+# The graph only loops while sync keeps changing what verify reads.
+MAX_PASSES = 3
+HASH_CHUNK = 1 << 20
+
+VERIFY_MODULES = ["build_verified_works.py", "catalog.py", "fetch_transport.py", "host_timeouts.py", "met_index.py", "run_metrics.py", "tracing.py", "url_canon.py"]
+
+
+@dataclass
+class Task:
+    name: str
+    command: List[str]
+    inputs: List[Path]
+    outputs: List[Path]
+    deps: List[str] = field(default_factory=list)
+    # Inputs that may be absent (e.g. the Met index before it is built).
+    optional_inputs: List[Path] = field(default_factory=list)
+
+
+def define_tasks(met_dump: Optional[Path], verify_args: List[str]) -> Dict[str, Task]:
+    decks = [Path(d["source"]) for d in build_dataset.DECKS]
+    tasks = [
+        Task(
+            "build",
+            [str(SCRIPTS / "build_dataset.py")],
+            inputs=[*decks, SCRIPTS / "build_dataset.py"],
+            outputs=[ARTWORKS_JSON, COMPARISON_CSV],
+        ),
+        Task(
+            "verify",
+            [str(SCRIPTS / "build_verified_works.py"), *verify_args],
+            inputs=[COMPARISON_CSV, *(SCRIPTS / m for m in VERIFY_MODULES)],
+            optional_inputs=[MET_INDEX_DB],
+            outputs=[WORKS_CSV, REPORT_MD],
+            deps=["build", *(["met_index"] if met_dump else [])],
+        ),
+        Task(
+            "sync",
+            [str(SCRIPTS / "sync_works_to_web.py")],
+            inputs=[WORKS_CSV, ARTWORKS_JSON, SCRIPTS / "sync_works_to_web.py", SCRIPTS / "catalog.py", SCRIPTS / "build_dataset.py"],
+            outputs=[ARTWORKS_JSON, COMPARISON_CSV],
+            deps=["verify"],
+        ),
+    ]
+    if met_dump:
+        tasks.append(
+            Task(
+                "met_index",
+                [str(SCRIPTS / "met_index.py"), str(met_dump)],
+                inputs=[met_dump, SCRIPTS / "met_index.py"],
+                outputs=[MET_INDEX_DB],
+            )
+        )
+    return {t.name: t for t in tasks}
+
+
+class Fingerprints:
+    """Content hashes of files, reusing the stored hash while size and mtime are unchanged."""
+
+    def __init__(self, memo: Dict[str, List]) -> None:
+        self.memo = memo
+
+    def file(self, path: Path) -> Optional[str]:
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        key = str(path)
+        cached = self.memo.get(key)
+        if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            return cached[2]
+        h = hashlib.sha256()
+        with path.open("rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+                h.update(chunk)
+        digest = h.hexdigest()
+        self.memo[key] = [st.st_size, st.st_mtime_ns, digest]
+        return digest
+
+    def task_inputs(self, task: Task) -> Tuple[str, List[Path]]:
+        """Combined digest of a task's inputs and command line, plus any missing required inputs."""
+        h = hashlib.sha256(json.dumps(task.command[1:]).encode("utf-8"))
+        missing = []
+        for path in task.inputs + task.optional_inputs:
+            digest = self.file(path)
+            if digest is None and path in task.inputs:
+                missing.append(path)
+            h.update(f"{path.relative_to(ROOT) if path.is_relative_to(ROOT) else path}={digest}\n".encode("utf-8"))
+        return h.hexdigest(), missing
+
+
+def load_state() -> Dict[str, Dict]:
+    if TASK_STATE_JSON.exists():
+        try:
+            return json.loads(TASK_STATE_JSON.read_text(encoding="utf-8"))
+        except ValueError:
+            pass
+    return {"tasks": {}, "files": {}}
+
+
+def save_state(state: Dict[str, Dict]) -> None:
+    TASK_STATE_JSON.parent.mkdir(parents=True, exist_ok=True)
+    TASK_STATE_JSON.write_text(json.dumps(state, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def selected_tasks(tasks: Dict[str, Task], targets: List[str]) -> List[str]:
+    """Targets plus everything they depend on, in dependency order."""
+    order: List[str] = []
+
+    def visit(name: str, stack: Set[str]) -> None:
+        if name in order:
+            return
+        if name in stack:
+            raise SystemExit(f"Dependency cycle at {name}")
+        for dep in tasks[name].deps:
+            visit(dep, stack | {name})
+        order.append(name)
+
+    for name in targets or list(tasks):
+        if name not in tasks:
+            raise SystemExit(f"Unknown task: {name} (known: {', '.join(tasks)})")
+        visit(name, set())
+    return order
+
+
+def stale_reason(task: Task, fps: Fingerprints, state: Dict[str, Dict], forced: Set[str]) -> Optional[str]:
+    if task.name in forced:
+        return "forced"
+    digest, missing = fps.task_inputs(task)
+    if missing:
+        if all(p.exists() for p in task.outputs):
+            return None  # cannot rebuild here; downstream uses the existing outputs
+        raise SystemExit(f"{task.name}: missing inputs {', '.join(str(p) for p in missing)} and no existing outputs")
+    recorded = state["tasks"].get(task.name, {}).get("inputs")
+    if recorded is None:
+        return "never run"
+    if recorded != digest:
+        return "inputs changed"
+    absent = [p for p in task.outputs if not p.exists()]
+    if absent:
+        return f"missing output {absent[0].name}"
+    return None
+
+
+def run_task(task: Task) -> Tuple[int, str, float]:
+    t0 = time.perf_counter()
+    proc = subprocess.run([sys.executable, *task.command], cwd=ROOT, capture_output=True, text=True)
+    return proc.returncode, proc.stdout + proc.stderr, time.perf_counter() - t0
+
+
+def run_pass(
+    tasks: Dict[str, Task],
+    order: List[str],
+    fps: Fingerprints,
+    state: Dict[str, Dict],
+    forced: Set[str],
+    jobs: int,
+    dry_run: bool,
+) -> Tuple[List[str], bool]:
+    """Walk the graph once, running stale tasks (independent ones in parallel).
+    Returns (tasks run, ok)."""
+    done: Set[str] = set()
+    ran: List[str] = []
+    running: Dict[Future, str] = {}
+    ok = True
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        while len(done) < len(order):
+            for name in order:
+                if name in done or name in running.values():
+                    continue
+                task = tasks[name]
+                if any(dep in order and dep not in done for dep in task.deps):
+                    continue
+                reason = stale_reason(task, fps, state, forced)
+                if dry_run and reason is None and any(dep in ran for dep in task.deps):
+                    reason = "upstream would run"
+                if reason is None:
+                    print(f"[{name}] up to date")
+                    done.add(name)
+                elif dry_run:
+                    print(f"[{name}] would run ({reason}): {' '.join(shlex.quote(c) for c in task.command)}")
+                    done.add(name)
+                    ran.append(name)
+                else:
+                    print(f"[{name}] running ({reason})")
+                    running[pool.submit(run_task, task)] = name
+            if not running:
+                continue
+            finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for fut in finished:
+                name = running.pop(fut)
+                code, output, seconds = fut.result()
+                for line in output.rstrip().splitlines():
+                    print(f"[{name}] {line}")
+                if code != 0:
+                    print(f"[{name}] failed with exit code {code} after {seconds:.1f}s", file=sys.stderr)
+                    ok = False
+                    # Let running tasks finish, but start nothing new.
+                    order = [n for n in order if n in done or n in running.values()]
+                    continue
+                print(f"[{name}] done in {seconds:.1f}s")
+                # Recorded after the run: sync rewrites one of its own inputs.
+                state["tasks"][name] = {"inputs": fps.task_inputs(tasks[name])[0], "finished_at": time.strftime("%Y-%m-%d %H:%M:%S")}
+                forced.discard(name)
+                done.add(name)
+                ran.append(name)
+    return ran, ok
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("targets", nargs="*", help="tasks to bring up to date (default: all)")
+    parser.add_argument("--force", action="append", default=[], metavar="TASK", help="run TASK even if up to date")
+    parser.add_argument("--dry-run", action="store_true", help="only report which tasks are stale")
+    parser.add_argument("--jobs", type=int, default=2, help="tasks run in parallel")
+    parser.add_argument("--met-dump", type=Path, default=None, help="MetObjects.csv; adds the met_index task")
+    parser.add_argument("--verify-args", default="", help="extra arguments for build_verified_works.py")
+    args = parser.parse_args()
+
+    tasks = define_tasks(args.met_dump, shlex.split(args.verify_args))
+    order = selected_tasks(tasks, args.targets)
+    state = load_state()
+    fps = Fingerprints(state.setdefault("files", {}))
+    state.setdefault("tasks", {})
+    forced = set(args.force)
+
+    for n in range(1, MAX_PASSES + 1):
+        ran, ok = run_pass(tasks, order, fps, state, forced, args.jobs, args.dry_run)
+        if not args.dry_run:
+            save_state(state)
+        if not ok:
+            return 1
+        if not ran or args.dry_run:
+            break
+        if n < MAX_PASSES:
+            print(f"-- pass {n} ran {', '.join(ran)}; checking again")
+    else:
+        print(f"Pass {MAX_PASSES} still ran {', '.join(ran)}; run again to confirm everything is up to date.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""Per-run metrics for build_verified_works.py.
+
+Collects fetch latency per host, cache outcomes, bytes downloaded, timeouts
+and per-stage wall time from the verifier's worker threads, and renders them
+as JSON (screen_results/verification_metrics.json) and as a report.md section.
+
+Usage (compare two saved runs):
+    python3 scripts/run_metrics.py old_metrics.json new_metrics.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+
+ROOT = Path(__file__).resolve().parents[1]
+METRICS_JSON = ROOT / "screen_results" / "verification_metrics.json"
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open.
+LATENCY_BUCKETS_MS = [50, 100, 250, 500, 1000, 2500, 5000, 12000]
+PERCENTILES = [50, 90, 95, 99]
+
+# Cache outcomes recorded by fetch_title.
+CACHE_OUTCOMES = ["offline_index", "fresh_hit", "revalidated", "miss", "stale_served"]
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1)))))
+    return sorted_values[k]
+
+
+def bucket_label(idx: int) -> str:
+    if idx < len(LATENCY_BUCKETS_MS):
+        return f"<={LATENCY_BUCKETS_MS[idx]}ms"
+    return f">{LATENCY_BUCKETS_MS[-1]}ms"
+
+
+class HostStats:
+    __slots__ = ("latencies_ms", "statuses", "bytes", "timeouts", "errors")
+
+    def __init__(self) -> None:
+        self.latencies_ms: List[float] = []
+        self.statuses: Dict[str, int] = {}
+        self.bytes = 0
+        self.timeouts = 0
+        self.errors = 0
+
+    def to_dict(self) -> Dict[str, object]:
+        lat = sorted(self.latencies_ms)
+        histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        for ms in lat:
+            idx = next((i for i, bound in enumerate(LATENCY_BUCKETS_MS) if ms <= bound), len(LATENCY_BUCKETS_MS))
+            histogram[idx] += 1
+        return {
+            "requests": len(lat),
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "bytes": self.bytes,
+            "latency_ms": {f"p{p}": round(percentile(lat, p), 1) for p in PERCENTILES} | {"max": round(lat[-1], 1) if lat else 0.0},
+            "histogram": {bucket_label(i): n for i, n in enumerate(histogram) if n},
+            "statuses": dict(sorted(self.statuses.items())),
+        }
+
+
+class RunMetrics:
+    """Thread-safe counters shared by every stage of one verification run."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.hosts: Dict[str, HostStats] = {}
+        self.cache: Dict[str, int] = {k: 0 for k in CACHE_OUTCOMES}
+        self.counters: Dict[str, int] = {}
+        self.stage_seconds: Dict[str, float] = {}
+
+    def record_fetch(self, host: str, seconds: float, status: str, nbytes: int = 0) -> None:
+        with self.lock:
+            stats = self.hosts.get(host)
+            if stats is None:
+                stats = self.hosts[host] = HostStats()
+            stats.latencies_ms.append(seconds * 1000)
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            stats.bytes += nbytes
+            if "timed out" in status or "timeout" in status.lower():
+                stats.timeouts += 1
+            if not status.startswith(("http_2", "http_3")):
+                stats.errors += 1
+
+    def record_cache(self, outcome: str) -> None:
+        with self.lock:
+            self.cache[outcome] = self.cache.get(outcome, 0) + 1
+
+    def incr(self, name: str, n: int = 1) -> None:
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def add_stage_time(self, stage: str, seconds: float) -> None:
+        with self.lock:
+            self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage_time(name, time.perf_counter() - t0)
+
+    def to_dict(self) -> Dict[str, object]:
+        with self.lock:
+            hosts = {h: s.to_dict() for h, s in sorted(self.hosts.items())}
+            cache = dict(self.cache)
+            counters = dict(sorted(self.counters.items()))
+            stages = {k: round(v, 3) for k, v in self.stage_seconds.items()}
+        lookups = sum(cache.values())
+        hits = cache["offline_index"] + cache["fresh_hit"] + cache["revalidated"]
+        return {
+            "started_at": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.started)),
+            "wall_seconds": round(time.time() - self.started, 3),
+            "stage_seconds": stages,
+            "cache": cache | {"hit_ratio": round(hits / lookups, 3) if lookups else 0.0},
+            "requests": sum(h["requests"] for h in hosts.values()),
+            "bytes_fetched": sum(h["bytes"] for h in hosts.values()),
+            "timeouts": sum(h["timeouts"] for h in hosts.values()),
+            "counters": counters,
+            "hosts": hosts,
+        }
+
+
+def merge_metrics(parts: List[Dict[str, object]]) -> Dict[str, object]:
+    """Combine metrics from shard runs. Counts, bytes and stage times add up;
+    wall time is the slowest shard; host percentiles are the worst shard's
+    (raw samples are not kept, so this is an upper bound)."""
+    hosts: Dict[str, Dict[str, object]] = {}
+    for part in parts:
+        for host, h in part["hosts"].items():
+            cur = hosts.get(host)
+            if cur is None:
+                hosts[host] = json.loads(json.dumps(h))
+                continue
+            for k in ("requests", "errors", "timeouts", "bytes"):
+                cur[k] += h[k]
+            cur["latency_ms"] = {k: max(v, h["latency_ms"].get(k, 0.0)) for k, v in cur["latency_ms"].items()}
+            for label, n in h["histogram"].items():
+                cur["histogram"][label] = cur["histogram"].get(label, 0) + n
+            for status, n in h["statuses"].items():
+                cur["statuses"][status] = cur["statuses"].get(status, 0) + n
+
+    def summed(key: str) -> Dict[str, float]:
+        out: Dict[str, float] = {}
+        for part in parts:
+            for k, v in part[key].items():
+                out[k] = out.get(k, 0) + v
+        return out
+
+    cache = {k: int(v) for k, v in summed("cache").items() if k != "hit_ratio"}
+    lookups = sum(cache.values())
+    hits = cache.get("offline_index", 0) + cache.get("fresh_hit", 0) + cache.get("revalidated", 0)
+    return {
+        "started_at": min(p["started_at"] for p in parts),
+        "wall_seconds": max(p["wall_seconds"] for p in parts),
+        "stage_seconds": {k: round(v, 3) for k, v in summed("stage_seconds").items()},
+        "cache": cache | {"hit_ratio": round(hits / lookups, 3) if lookups else 0.0},
+        "requests": sum(p["requests"] for p in parts),
+        "bytes_fetched": sum(p["bytes_fetched"] for p in parts),
+        "timeouts": sum(p["timeouts"] for p in parts),
+        "counters": dict(sorted(summed("counters").items())),
+        "hosts": dict(sorted(hosts.items())),
+        "shards": len(parts),
+    }
+
+
+def write_metrics_json(data: Dict[str, object], path: Path = METRICS_JSON) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+
+
+def report_lines(data: Dict[str, object], max_hosts: int = 12) -> List[str]:
+    """Markdown summary for report.md: totals, stages, then the slowest hosts."""
+    cache = data["cache"]
+    lines = [
+        "## Run metrics",
+        "",
+        f"- Wall time: {data['wall_seconds']:.1f}s"
+        + "".join(f" | {k} {v:.1f}s" for k, v in data["stage_seconds"].items()),
+        f"- Requests: {data['requests']} | Bytes fetched: {data['bytes_fetched']:,} | Timeouts: {data['timeouts']}",
+        "- Cache: " + " | ".join(f"{k} {cache[k]}" for k in CACHE_OUTCOMES) + f" | hit ratio {cache['hit_ratio']:.0%}",
+    ]
+    if data["counters"]:
+        lines.append("- Counters: " + " | ".join(f"{k} {v}" for k, v in data["counters"].items()))
+    hosts = sorted(data["hosts"].items(), key=lambda kv: -kv[1]["latency_ms"]["p95"])
+    if hosts:
+        lines.append("")
+        lines.append("| Host | Requests | Errors | Timeouts | p50 ms | p95 ms | max ms | Bytes |")
+        lines.append("| --- | ---: | ---: | ---: | ---: | ---: | ---: | ---: |")
+        for host, h in hosts[:max_hosts]:
+            lat = h["latency_ms"]
+            lines.append(
+                f"| {host} | {h['requests']} | {h['errors']} | {h['timeouts']} | "
+                f"{lat['p50']:.0f} | {lat['p95']:.0f} | {lat['max']:.0f} | {h['bytes']:,} |"
+            )
+        if len(hosts) > max_hosts:
+            lines.append(f"| ({len(hosts) - max_hosts} more hosts in the metrics JSON) | | | | | | | |")
+    lines.append("")
+    return lines
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare two verification metrics files.")
+    parser.add_argument("before", type=Path)
+    parser.add_argument("after", type=Path)
+    args = parser.parse_args()
+
+    for p in (args.before, args.after):
+        if not p.exists():
+            print(f"Missing input: {p}", file=sys.stderr)
+            return 1
+    a = json.loads(args.before.read_text(encoding="utf-8"))
+    b = json.loads(args.after.read_text(encoding="utf-8"))
+    print(f"wall_seconds: {a['wall_seconds']:.1f} -> {b['wall_seconds']:.1f}")
+    print(f"requests: {a['requests']} -> {b['requests']}; bytes: {a['bytes_fetched']:,} -> {b['bytes_fetched']:,}")
+    print(f"cache hit ratio: {a['cache']['hit_ratio']:.0%} -> {b['cache']['hit_ratio']:.0%}")
+    for host in sorted(set(a["hosts"]) | set(b["hosts"])):
+        pa = a["hosts"].get(host, {}).get("latency_ms", {}).get("p95", 0.0)
+        pb = b["hosts"].get(host, {}).get("latency_ms", {}).get("p95", 0.0)
+        print(f"  {host}: p95 {pa:.0f}ms -> {pb:.0f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
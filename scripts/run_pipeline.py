@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Run build -> verify -> sync in one process.
+
+The staged scripts hand data to each other through files: build_dataset.py
+writes artworks.json and comparison_table.csv, build_verified_works.py
+re-reads the CSV, and sync_works_to_web.py re-reads works.csv and
+artworks.json and rewrites both. Here the built items go straight to the
+verifier as InputRow records, the verified works rows go straight to the
+sync step, and artworks.json / comparison_table.csv are written once at the
+end. The verifier still writes works.csv and report.md itself. The three
+scripts keep working on their own.
+
+Arguments not listed below are passed to build_verified_works.py, except
+--shard and --merge-shards: a shard run verifies only part of the rows, so
+run and merge shards with the verifier itself, then use --skip-verify here.
+
+Usage:
+    python3 scripts/run_pipeline.py
+    python3 scripts/run_pipeline.py --skip-build --transport replay
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from typing import Dict, Iterable, Iterator, List
+
+import build_dataset
+import build_verified_works as bvw
+import catalog
+import sync_works_to_web as sync
+
+
+def csv_text(value: object) -> str:
+    # What csv.writer would store and csv.reader read back.
+    return "" if value is None else str(value)
+
+
+def input_rows(items: Iterable[dict]) -> Iterator[bvw.InputRow]:
+    """The InputRows load_rows() would read from comparison_table.csv written for items."""
+    projection = bvw.row_projection(build_dataset.COMPARISON_HEADER)
+    for item in items:
+        yield bvw.project_row([csv_text(v) for v in build_dataset.comparison_row(item)], projection)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--skip-build", action="store_true", help="start from the existing artworks.json instead of the PPTX decks")
+    parser.add_argument("--skip-verify", action="store_true", help="sync the existing works.csv without verifying")
+    parser.add_argument(
+        "--reproducible",
+        action="store_true",
+        help="output bytes depend only on the inputs: generatedAt from SOURCE_DATE_EPOCH or git history, no timestamp in report.md",
+    )
+    args, verify_argv = parser.parse_known_args()
+    sharding = [a for a in verify_argv if a.split("=", 1)[0] in ("--shard", "--merge-shards")]
+    if sharding:
+        parser.error(f"{sharding[0]} is not supported here; run build_verified_works.py for shards, then use --skip-verify")
+    reproducible = build_dataset.reproducible_mode(args.reproducible)
+    if reproducible:
+        verify_argv.append("--reproducible")
+
+    timings: List[str] = []
+    t0 = time.perf_counter()
+    if args.skip_build:
+        if not sync.ARTWORKS_JSON.exists():
+            print(f"Missing input: {sync.ARTWORKS_JSON}", file=sys.stderr)
+            return 1
+        payload = catalog.artworks_catalog(sync.ARTWORKS_JSON).document
+    else:
+        items, stats = build_dataset.build()
+        payload = build_dataset.build_payload(items, stats, reproducible)
+    items = payload.get("items", [])
+    timings.append(f"build {time.perf_counter() - t0:.1f}s")
+
+    t0 = time.perf_counter()
+    works_out: Dict[str, Dict[str, str]] = {}
+    if args.skip_verify:
+        if not sync.WORKS_CSV.exists():
+            print(f"Missing input: {sync.WORKS_CSV}", file=sys.stderr)
+            return 1
+        works = sync.load_works()
+    else:
+        code = bvw.main(verify_argv, rows=input_rows(items), works_out=works_out)
+        if code != 0:
+            return code
+        works = catalog.Catalog.of(list(works_out.values()), catalog.WORKS_INDEXES)
+    if items and not len(works):
+        print("Verification produced no works rows; nothing to sync.", file=sys.stderr)
+        return 1
+    timings.append(f"verify {time.perf_counter() - t0:.1f}s")
+
+    t0 = time.perf_counter()
+    bg_count, verified_count, _, _, applied = sync.sync_items(items, works, {})
+    sync.write_artworks_json(payload, reproducible)
+    build_dataset.write_comparison_table(items)
+    # Leave the state the incremental sync expects, so a later sync_works_to_web.py run skips these items.
+    sync.save_sync_state({"items": applied, "comparison_sha256": sync.file_digest(sync.COMPARISON_CSV)})
+    timings.append(f"sync {time.perf_counter() - t0:.1f}s")
+
+    print(f"Background synced for {bg_count} items; verified period/source synced for {verified_count} items")
+    print(f"Wrote {len(items)} items -> {sync.ARTWORKS_JSON}")
+    print(f"Wrote comparison table -> {sync.COMPARISON_CSV}")
+    print("Stages: " + " | ".join(timings))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""Suggest source URLs for unverified rows from an offline inverted index.
+
+The index covers every page in the verifier's title cache plus, when it has
+been built, the Met open-access dump (scripts/met_index.py). Documents and
+rows are tokenized with the verifier's own significant_title_tokens /
+work_tokens, and candidates are ranked with the same weights as
+source_relevance_for_work (title-specific hit 2, author hit 3, Met object
+page +1), then by source tier. No network is used.
+
+Usage:
+    python3 scripts/source_suggest.py build
+    python3 scripts/source_suggest.py suggest            # needs_human rows in works.csv
+    python3 scripts/source_suggest.py query "Peacock Room" --author "Whistler"
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+import build_verified_works as bvw
+from catalog import works_catalog
+from met_index import MetIndex
+from url_canon import url_key
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SOURCE_INDEX_DB = ROOT / "screen_results" / "source_index.sqlite3"
+SUGGESTIONS_JSON = ROOT / "screen_results" / "source_suggestions.json"
+SUGGEST_DETAILS = {"needs_human_title_mismatch", "needs_human_source_missing"}
+BATCH_SIZE = 5000
+# Candidates pulled from SQLite per query before the tier/Met tie-breaks.
+CANDIDATE_POOL = 50
+# Tokens on more pages than this (common object words, prolific makers) only
+# add to the score of pages found through a rarer token.
+RARE_TOKEN_DF = 5000
+SQLITE_MAX_PARAMS = 900
+
+
+def document_tokens(text: str) -> Set[str]:
+    return {bvw.fold_text(t) for t in bvw.significant_title_tokens(text)}
+
+
+# (url, page title, meta description, origin, text to tokenize)
+Document = Tuple[str, str, str, str, str]
+
+
+def cached_documents(cache: Dict[str, Dict[str, str]]) -> Iterator[Document]:
+    for key, entry in cache.items():
+        if entry.get("alias_of") or bvw.cache_entry_kind(entry) != "success":
+            continue
+        title = entry.get("page_title") or ""
+        if not title or title == "(title fetch failed)":
+            continue
+        meta = entry.get("meta_description") or ""
+        yield entry.get("final_url") or key, title, meta, "cache", f"{title} {meta}"
+
+
+def met_documents(met: MetIndex) -> Iterator[Document]:
+    for rec in met.iter_records():
+        result = bvw.met_object_result(rec["object_id"], rec)
+        # Tokenize the record itself, not the museum-name suffix every page title carries.
+        text = f"{rec['title']} {result['meta_description']}"
+        yield result["final_url"], result["page_title"], result["meta_description"], "met_index", text
+
+
+def build_source_index(db_path: Path = SOURCE_INDEX_DB, include_met: bool = True) -> int:
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = db_path.with_suffix(db_path.suffix + ".tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+
+    conn = sqlite3.connect(tmp_path)
+    conn.execute("CREATE TABLE docs (doc_id INTEGER PRIMARY KEY, url TEXT, title TEXT, meta TEXT, origin TEXT, tokens TEXT)")
+    conn.execute("CREATE TABLE postings (token TEXT, doc_id INTEGER, PRIMARY KEY (token, doc_id)) WITHOUT ROWID")
+
+    sources = [cached_documents(bvw.load_cache())]
+    met = MetIndex()
+    if include_met and met.available():
+        sources.append(met_documents(met))
+
+    seen: Set[str] = set()
+    docs, postings = [], []
+    for source in sources:
+        for url, title, meta, origin, text in source:
+            key = url_key(url)
+            if key in seen:
+                continue
+            seen.add(key)
+            doc_id = len(seen)
+            tokens = sorted(document_tokens(text))
+            docs.append((doc_id, url, title, meta, origin, " ".join(tokens)))
+            postings.extend((tok, doc_id) for tok in tokens)
+            if len(docs) >= BATCH_SIZE:
+                conn.executemany("INSERT INTO docs VALUES (?, ?, ?, ?, ?, ?)", docs)
+                conn.executemany("INSERT OR IGNORE INTO postings VALUES (?, ?)", postings)
+                docs, postings = [], []
+    conn.executemany("INSERT INTO docs VALUES (?, ?, ?, ?, ?, ?)", docs)
+    conn.executemany("INSERT OR IGNORE INTO postings VALUES (?, ?)", postings)
+    conn.execute("CREATE TABLE token_df AS SELECT token, COUNT(*) AS df FROM postings GROUP BY token")
+    conn.execute("CREATE UNIQUE INDEX token_df_token ON token_df (token)")
+    conn.commit()
+    conn.execute("VACUUM")
+    conn.close()
+    tmp_path.replace(db_path)
+    return len(seen)
+
+
+class SourceIndex:
+    def __init__(self, db_path: Path = SOURCE_INDEX_DB) -> None:
+        self.conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+
+    def suggest(self, title: str, author: str, limit: int = 5, exclude: Optional[Set[str]] = None) -> List[Dict[str, object]]:
+        tokens = bvw.work_tokens(title, author)
+        weights: Dict[str, int] = {t: 2 for t in tokens.title_specific}
+        weights.update({t: 3 for t in tokens.author})
+        if not weights:
+            return []
+        marks = ", ".join("?" for _ in weights)
+        df = dict(self.conn.execute(f"SELECT token, df FROM token_df WHERE token IN ({marks})", list(weights)))
+        rare = [t for t in weights if 0 < df.get(t, 0) <= RARE_TOKEN_DF]
+
+        rows: List[Tuple[str, str, str, str, int, List[str]]] = []
+        if rare:
+            # Pages reached through a distinctive token, scored on all their tokens.
+            doc_ids = [
+                d for (d,) in self.conn.execute(
+                    f"SELECT DISTINCT doc_id FROM postings WHERE token IN ({', '.join('?' for _ in rare)})", rare
+                )
+            ]
+            for i in range(0, len(doc_ids), SQLITE_MAX_PARAMS):
+                chunk = doc_ids[i : i + SQLITE_MAX_PARAMS]
+                for url, page_title, meta, origin, doc_tokens in self.conn.execute(
+                    f"SELECT url, title, meta, origin, tokens FROM docs WHERE doc_id IN ({', '.join('?' for _ in chunk)})", chunk
+                ):
+                    matched = [t for t in doc_tokens.split() if t in weights]
+                    rows.append((url, page_title, meta, origin, sum(weights[t] for t in matched), matched))
+        else:
+            values = ", ".join("(?, ?)" for _ in weights)
+            params: List[object] = [x for kv in weights.items() for x in kv]
+            for url, page_title, meta, origin, score, matched in self.conn.execute(
+                f"WITH q(token, w) AS (VALUES {values}) "
+                "SELECT d.url, d.title, d.meta, d.origin, SUM(q.w) AS score, group_concat(q.token, ' ') "
+                "FROM q JOIN postings p ON p.token = q.token JOIN docs d ON d.doc_id = p.doc_id "
+                "GROUP BY p.doc_id ORDER BY score DESC LIMIT ?",
+                [*params, CANDIDATE_POOL + len(exclude or ())],
+            ):
+                rows.append((url, page_title, meta, origin, score, matched.split()))
+
+        out = []
+        for url, page_title, meta, origin, score, matched in rows:
+            if exclude and url_key(url) in exclude:
+                continue
+            if "/art/collection/search/" in url:
+                score += 1
+            out.append(
+                {
+                    "url": url,
+                    "title": page_title,
+                    "institution": bvw.institution_for_url(url),
+                    "tier": bvw.source_tier(url),
+                    "score": score,
+                    "matched": sorted(matched),
+                    "origin": origin,
+                    "meta_description": meta,
+                }
+            )
+        out.sort(key=lambda c: (-c["score"], c["tier"], c["url"]))
+        return out[:limit]
+
+
+def rows_needing_sources(detail_filter: Set[str], ids: List[str]) -> List[Tuple[bvw.RowTask, str]]:
+    works = works_catalog(bvw.OUTPUT_CSV)
+    out = []
+    for task in bvw.iter_row_tasks(bvw.load_rows()):
+        work = works.get(task.item_id)
+        if not work:
+            continue
+        if ids and task.item_id not in ids:
+            continue
+        if not ids and work.get("status_detail") not in detail_filter:
+            continue
+        out.append((task, work.get("status_detail", "")))
+    return out
+
+
+def print_candidates(candidates: List[Dict[str, object]]) -> None:
+    if not candidates:
+        print("  - (no candidates)")
+    for c in candidates:
+        print(f"  - [{c['score']}] tier {c['tier']} {c['institution']} | {c['title']} | {c['url']}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--index", type=Path, default=SOURCE_INDEX_DB)
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="index cached pages (and the Met dump index when present)")
+    build.add_argument("--no-met", action="store_true", help="skip the Met open-access index")
+    suggest = sub.add_parser("suggest", help="rank candidates for needs_human rows in works.csv")
+    suggest.add_argument("ids", nargs="*", help="only these item ids (any status)")
+    suggest.add_argument("--limit", type=int, default=5)
+    suggest.add_argument("--all-needs-human", action="store_true", help="include every needs_human detail")
+    suggest.add_argument("--out", type=Path, default=SUGGESTIONS_JSON)
+    query = sub.add_parser("query", help="rank candidates for a free-text title")
+    query.add_argument("title")
+    query.add_argument("--author", default="")
+    query.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        t0 = time.perf_counter()
+        count = build_source_index(args.index, include_met=not args.no_met)
+        print(f"Indexed {count} pages -> {args.index} ({time.perf_counter() - t0:.1f}s)")
+        return 0
+
+    if not args.index.exists():
+        print(f"Missing index: {args.index} (run `build` first)", file=sys.stderr)
+        return 1
+    index = SourceIndex(args.index)
+
+    if args.command == "query":
+        t0 = time.perf_counter()
+        candidates = index.suggest(args.title, args.author, args.limit)
+        print_candidates(candidates)
+        print(f"({(time.perf_counter() - t0) * 1000:.1f} ms)")
+        return 0
+
+    if not bvw.OUTPUT_CSV.exists():
+        print(f"Missing input: {bvw.OUTPUT_CSV}", file=sys.stderr)
+        return 1
+    details = set(SUGGEST_DETAILS)
+    if args.all_needs_human:
+        details |= {"needs_human_source_quality", "needs_human_other"}
+    results = {}
+    t0 = time.perf_counter()
+    for task, detail in rows_needing_sources(details, args.ids):
+        attached = {url_key(u) for u in task.source_urls}
+        candidates = index.suggest(task.relevance_title, task.author, args.limit, exclude=attached)
+        results[task.item_id] = {"title": task.title, "status_detail": detail, "candidates": candidates}
+        print(f"- `{task.item_id}` [{detail}]: {task.title}")
+        print_candidates(candidates)
+    elapsed = time.perf_counter() - t0
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(json.dumps(results, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    print(f"Wrote {args.out} ({len(results)} rows, {elapsed * 1000:.0f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""Worst-case latency check for the text and HTML extractors.
+
+Feeds every extractor (slide-text parsers in build_dataset.py, head/meta
+parsers in build_verified_works.py) pathological inputs: long capitalized
+runs, punctuated and hyphenated tokens with a word boundary every few
+characters, unclosed <title> tags, huge attribute-less <meta> blocks and
+similar, plus random mixes of those fragments. The check is on growth,
+not speed: a case fails if quadrupling its input more than GROWTH_LIMIT-folds
+its time (linear code takes about 4x, quadratic backtracking about 16x).
+The absolute budget is only a backstop for runaway cases, far above what a
+slow machine needs. No network.
+
+Usage:
+    python3 scripts/stress_extractors.py
+    python3 scripts/stress_extractors.py --bytes 50000 --only extract_author
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import random
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+import build_dataset as bd
+import build_verified_works as bvw
+
+
+# The most HTML one fetch reads; slide texts are far shorter.
+STRESS_BYTES = bvw.MAX_HEAD_BYTES
+# Backstop only: the slowest extractor takes about 0.6s here, and quadratic
+# cases took minutes before the extractors were bounded.
+BUDGET_SECONDS = 10.0
+# Timings below this are too noisy to compare.
+GROWTH_FLOOR_SECONDS = 0.05
+# Quadrupling the input should take about 4x the time; 16x means quadratic.
+GROWTH_LIMIT = 8.0
+# Pathological cases are timed as the best of this many runs, to keep noise out of the growth ratio.
+REPEATS = 2
+FUZZ_CASES = 200
+FUZZ_BYTES = 20_000
+
+EXTRACTORS: Dict[str, Callable[[str], object]] = {
+    "extract_author": bd.extract_author,
+    "extract_year": bd.extract_year,
+    "extract_period": lambda s: bd.extract_period(s, ""),
+    "extract_material": bd.extract_material,
+    "extract_urls_from_text": bvw.extract_urls_from_text,
+    "significant_title_tokens": bvw.significant_title_tokens,
+    "clean_html_title": bvw.clean_html_title,
+    "clean_meta_description": bvw.clean_meta_description,
+    "read_head_metadata": lambda s: bvw.read_head_metadata(io.BytesIO(s.encode("utf-8"))),
+    "sniff_html_charset": lambda s: bvw.sniff_html_charset(s.encode("utf-8")[: bvw.CHARSET_PRESCAN_BYTES]),
+}
+
+# name -> unit repeated to the target size (prefix, unit, suffix)
+PATHOLOGICAL: Dict[str, Tuple[str, str, str]] = {
+    "punctuated token": ("", "A.", ","),
+    "hyphenated token": ("", "Ab-", " oak,"),
+    "capitalized run": ("", "Abc ", ""),
+    "capitalized run, commas": ("", "Abc Def, ", "oak"),
+    "particles run": ("Jean", " de la", ","),
+    "whitespace gap": ("Charles", " ", "Mackintosh,"),
+    "year prefixes": ("", "c. ca. 18", ""),
+    "year ranges": ("", "1850-", ""),
+    "century words": ("", "early 19 th - ", ""),
+    "url run": ("", "http://", ""),
+    "unclosed title": ("", "<title>", ""),
+    "attribute-less meta": ("<meta ", "a", ""),
+    "open meta tags": ("<head>", '<meta content="', ""),
+    "meta without content": ("<head>", '<meta name="description" ', ""),
+    "unterminated comment": ("<head><!--", "a", ""),
+    "angle brackets": ("<head>", "<", ""),
+}
+FUZZ_FRAGMENTS = [
+    "A.", "Ab-", "Abc ", "de ", ", ", "oak ", "c. ", "1850", "-", " ", "\n", "19th ", "century ", "early ",
+    "http://", "<title>", "</title>", "<meta ", 'name="description" ', 'content="', '"', "'", ">", "<", "<!--", "artist ",
+]
+
+
+def pathological(parts: Tuple[str, str, str], size: int) -> str:
+    prefix, unit, suffix = parts
+    return prefix + unit * max(1, (size - len(prefix) - len(suffix)) // len(unit)) + suffix
+
+
+def fuzz_input(rng: random.Random, size: int) -> str:
+    out: List[str] = []
+    n = 0
+    while n < size:
+        frag = rng.choice(FUZZ_FRAGMENTS) * rng.choice([1, 1, 1, 4, 64])
+        out.append(frag)
+        n += len(frag)
+    return "".join(out)
+
+
+def timed(fn: Callable[[str], object], text: str, repeats: int = 1) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bytes", type=int, default=STRESS_BYTES, help="size of each pathological input")
+    parser.add_argument("--budget", type=float, default=BUDGET_SECONDS, help="seconds allowed per call (backstop)")
+    parser.add_argument("--fuzz", type=int, default=FUZZ_CASES, help="random inputs per extractor")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--only", action="append", default=[], metavar="NAME", help="run only this extractor (repeatable)")
+    args = parser.parse_args()
+
+    unknown = [n for n in args.only if n not in EXTRACTORS]
+    if unknown:
+        print(f"Unknown extractor: {', '.join(unknown)} (known: {', '.join(EXTRACTORS)})", file=sys.stderr)
+        return 1
+    names = args.only or list(EXTRACTORS)
+    failures: List[str] = []
+
+    print(f"{'extractor':<26} {'worst input':<26} {'seconds':>8} {'x4 growth':>10}")
+    for name in names:
+        fn = EXTRACTORS[name]
+        worst = (0.0, "", 0.0)
+        for label, parts in PATHOLOGICAL.items():
+            quarter = timed(fn, pathological(parts, args.bytes // 4), REPEATS)
+            full = timed(fn, pathological(parts, args.bytes), REPEATS)
+            growth = full / quarter if quarter > 0 else 1.0
+            if full > worst[0]:
+                worst = (full, label, growth)
+            if full > args.budget:
+                failures.append(f"{name}: {label} took {full:.3f}s (budget {args.budget}s)")
+            elif full > GROWTH_FLOOR_SECONDS and growth > GROWTH_LIMIT:
+                failures.append(f"{name}: {label} grew {growth:.1f}x when the input quadrupled")
+
+        rng = random.Random(f"{args.seed}:{name}")
+        for i in range(args.fuzz):
+            text = fuzz_input(rng, FUZZ_BYTES)
+            seconds = timed(fn, text)
+            growth = 0.0
+            if GROWTH_FLOOR_SECONDS < seconds <= args.budget:
+                # Only slow inputs are worth re-timing; repeating the text keeps its structure.
+                growth = timed(fn, text * 4) / seconds
+                if growth > GROWTH_LIMIT:
+                    failures.append(f"{name}: fuzz #{i} (seed {args.seed}) grew {growth:.1f}x when repeated 4 times")
+            if seconds > worst[0]:
+                worst = (seconds, f"fuzz #{i}", growth)
+            if seconds > args.budget:
+                failures.append(f"{name}: fuzz #{i} (seed {args.seed}) took {seconds:.3f}s (budget {args.budget}s)")
+
+        seconds, label, growth = worst
+        print(f"{name:<26} {label:<26} {seconds:>8.3f} {growth:>9.1f}x" if growth else f"{name:<26} {label:<26} {seconds:>8.3f} {'':>10}")
+
+    if failures:
+        print(f"\n{len(failures)} failed:", file=sys.stderr)
+        for line in failures:
+            print(f"  {line}", file=sys.stderr)
+        return 1
+    print(f"\nAll extractors grow linearly on {args.bytes:,}-byte inputs and {args.fuzz} fuzz cases each.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
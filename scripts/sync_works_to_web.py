@@ -5,20 +5,32 @@ Rules:
 - update historical backgrounds (ZH/EN + combined) for all rows present in works.csv
 - update period/sources only for rows with status=updated
 - keep rows 35-60 untouched implicitly (they are excluded from works.csv)
+- incremental: items whose works.csv row and JSON entry are unchanged since
+  the last sync (screen_results/sync_state.json) are skipped, files are only
+  rewritten when something changed, and comparison_table.csv is patched
+  row by row; --full re-syncs everything
 """
 
 from __future__ import annotations
 
+import argparse
 import csv
+import hashlib
 import json
 import re
-import sys
 from pathlib import Path
 
+import build_dataset
+import catalog
+
 
 ROOT = Path(__file__).resolve().parents[1]
 WORKS_CSV = ROOT / "works.csv"
 ARTWORKS_JSON = ROOT / "app" / "data" / "artworks.json"
+COMPARISON_CSV = ROOT / "app" / "data" / "comparison_table.csv"
+SYNC_STATE_JSON = ROOT / "screen_results" / "sync_state.json"
+# works.csv columns that sync_item() reads; a change to any of them re-syncs the item.
+SYNCED_WORKS_FIELDS = ["historical_background_zh", "historical_background_en", "status", "confirmed_year_expr", "sources"]
 
 GENERIC_BG_ZH = {
     "常与非洲语境中的仪式权力、宫廷文化、社会记忆，以及后期博物馆收藏史相关。",
@@ -34,9 +46,8 @@ MISSING_SOURCE_SENTENCE_ZH = "当前仍需补充更明确的单件作品来源
 MISSING_SOURCE_SENTENCE_EN = "The current course entry still needs a stronger object-level source set for final verification in"
 
 
-def load_works():
-    rows = list(csv.DictReader(WORKS_CSV.open(encoding="utf-8-sig", newline="")))
-    return {r["id"]: r for r in rows}
+def load_works() -> catalog.Catalog:
+    return catalog.works_catalog(WORKS_CSV)
 
 
 def parse_sources_json(raw: str):
@@ -188,79 +199,190 @@ def _rewrite_missing_source_placeholder(meta: dict, item: dict) -> None:
     meta["historicalBackground"] = f"{zh}\n{en}".strip()
 
 
-def sync_artworks_json():
-    data = json.loads(ARTWORKS_JSON.read_text(encoding="utf-8"))
-    works = load_works()
+def load_sync_state() -> dict:
+    if not SYNC_STATE_JSON.exists():
+        return {}
+    try:
+        return json.loads(SYNC_STATE_JSON.read_text(encoding="utf-8"))
+    except ValueError:
+        return {}
+
+
+def save_sync_state(state: dict) -> None:
+    SYNC_STATE_JSON.parent.mkdir(parents=True, exist_ok=True)
+    SYNC_STATE_JSON.write_text(json.dumps(state, ensure_ascii=False, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def _digest(value) -> str:
+    return hashlib.sha1(json.dumps(value, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def works_row_digest(row) -> str:
+    return _digest([row.get(k, "") for k in SYNCED_WORKS_FIELDS]) if row else ""
+
+
+def file_digest(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def sync_item(item: dict, row) -> tuple[bool, bool]:
+    """Apply one works.csv row (or None) to one artworks.json item in place.
+    Returns (background synced, period/sources synced). Re-applying the same
+    row to the result leaves it unchanged."""
+    meta = item.setdefault("metadata", {})
+    background_synced = verified_synced = False
+    if row:
+        bg_zh = (row.get("historical_background_zh") or "").strip()
+        bg_en = (row.get("historical_background_en") or "").strip()
+        if bg_zh or bg_en:
+            meta["historicalBackgroundZh"] = bg_zh
+            meta["historicalBackgroundEn"] = bg_en
+            meta["historicalBackground"] = f"{bg_zh}\n{bg_en}".strip()
+            background_synced = True
+
+        if row.get("status") == "updated":
+            confirmed_period = (row.get("confirmed_year_expr") or "").strip()
+            if confirmed_period:
+                meta["period"] = confirmed_period
+                # Keep only production period on web; clear year field for artworks.
+                if meta.get("recordType") == "artwork":
+                    meta["year"] = ""
+            src_urls = parse_sources_json(row.get("sources", ""))
+            if src_urls:
+                meta["historicalBackgroundSources"] = src_urls
+            verified_synced = True
+
+    # Replace old course-level defaults with item-level fallback text for web reading.
+    if _is_generic_background(meta.get("historicalBackgroundZh", ""), meta.get("historicalBackgroundEn", "")):
+        fb_zh, fb_en = _fallback_detail_background(item)
+        meta["historicalBackgroundZh"] = fb_zh
+        meta["historicalBackgroundEn"] = fb_en
+        meta["historicalBackground"] = f"{fb_zh}\n{fb_en}".strip()
+
+    _rewrite_missing_source_placeholder(meta, item)
+
+    item["studyDescription"] = build_study_description(
+        meta.get("material", ""),
+        meta.get("period", ""),
+        meta.get("historicalBackgroundZh", ""),
+        meta.get("historicalBackgroundEn", ""),
+    )
+    return background_synced, verified_synced
 
+
+def sync_items(items: list, works: dict, applied: dict):
+    """Apply works rows to items in place, skipping items whose works row and
+    content match their applied-state entry. Returns (background updates,
+    verified updates, changed items by id, skipped, new applied state)."""
+    synced_state = {}
     background_updates = 0
     verified_updates = 0
+    skipped = 0
+    changed = {}
 
-    for item in data.get("items", []):
+    for item in items:
         item_id = item.get("id")
-        meta = item.setdefault("metadata", {})
-        if item_id and item_id in works:
-            row = works[item_id]
-            bg_zh = (row.get("historical_background_zh") or "").strip()
-            bg_en = (row.get("historical_background_en") or "").strip()
-            if bg_zh or bg_en:
-                meta["historicalBackgroundZh"] = bg_zh
-                meta["historicalBackgroundEn"] = bg_en
-                meta["historicalBackground"] = f"{bg_zh}\n{bg_en}".strip()
-                background_updates += 1
-
-            if row.get("status") == "updated":
-                confirmed_period = (row.get("confirmed_year_expr") or "").strip()
-                if confirmed_period:
-                    meta["period"] = confirmed_period
-                    # Keep only production period on web; clear year field for artworks.
-                    if meta.get("recordType") == "artwork":
-                        meta["year"] = ""
-                src_urls = parse_sources_json(row.get("sources", ""))
-                if src_urls:
-                    meta["historicalBackgroundSources"] = src_urls
-                verified_updates += 1
-
-        # Replace old course-level defaults with item-level fallback text for web reading.
-        if _is_generic_background(meta.get("historicalBackgroundZh", ""), meta.get("historicalBackgroundEn", "")):
-            fb_zh, fb_en = _fallback_detail_background(item)
-            meta["historicalBackgroundZh"] = fb_zh
-            meta["historicalBackgroundEn"] = fb_en
-            meta["historicalBackground"] = f"{fb_zh}\n{fb_en}".strip()
-
-        _rewrite_missing_source_placeholder(meta, item)
-
-        item["studyDescription"] = build_study_description(
-            meta.get("material", ""),
-            meta.get("period", ""),
-            meta.get("historicalBackgroundZh", ""),
-            meta.get("historicalBackgroundEn", ""),
-        )
-
-    # Refresh generated timestamp
-    data["generatedAt"] = __import__("datetime").datetime.now(__import__("datetime").timezone.utc).isoformat()
-    ARTWORKS_JSON.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
-    return background_updates, verified_updates
+        row = works.get(item_id) if item_id else None
+        row_digest = works_row_digest(row)
+        before = _digest(item)
+        if item_id and applied.get(item_id) == [row_digest, before]:
+            synced_state[item_id] = applied[item_id]
+            skipped += 1
+            continue
 
+        background_synced, verified_synced = sync_item(item, row)
+        background_updates += background_synced
+        verified_updates += verified_synced
+        after = _digest(item)
+        if after != before:
+            changed[item_id] = item
+        if item_id:
+            synced_state[item_id] = [row_digest, after]
+    return background_updates, verified_updates, changed, skipped, synced_state
+
+
+def write_artworks_json(data: dict, reproducible: bool = False) -> None:
+    # Refresh generated timestamp; reproducible runs keep the build's (SOURCE_DATE_EPOCH or a commit time).
+    if not (reproducible and data.get("generatedAt")):
+        data["generatedAt"] = build_dataset.generated_at([WORKS_CSV], reproducible)
+    ARTWORKS_JSON.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
 
-def rebuild_comparison_table():
-    sys.path.insert(0, str(ROOT / "scripts"))
-    import build_dataset  # type: ignore
 
-    data = json.loads(ARTWORKS_JSON.read_text(encoding="utf-8"))
-    build_dataset.write_comparison_table(data.get("items", []))
+def sync_artworks_json(state: dict, full: bool = False, reproducible: bool = False):
+    """Sync works.csv into artworks.json, touching only items whose works row
+    or JSON entry changed since the last sync recorded in state. The file is
+    rewritten (with a new generatedAt, unless reproducible) only when some item changed.
+    Returns (background updates, verified updates, changed items by id, skipped)."""
+    artworks = catalog.artworks_catalog(ARTWORKS_JSON)
+    applied = {} if full else state.get("items", {})
+    background_updates, verified_updates, changed, skipped, state["items"] = sync_items(artworks, load_works(), applied)
+    if changed:
+        write_artworks_json(artworks.document, reproducible)
+    return background_updates, verified_updates, changed, skipped
+
+
+def rebuild_comparison_table(state: dict, changed: dict) -> str:
+    """Bring comparison_table.csv up to date with artworks.json. If the CSV is
+    the one the last sync wrote, only the rows of changed items are
+    regenerated (all other rows are copied through); otherwise the table is
+    rebuilt from every item. Returns "unchanged", "patched" or "rebuilt"."""
+    table_is_ours = COMPARISON_CSV.exists() and state.get("comparison_sha256") == file_digest(COMPARISON_CSV)
+    if table_is_ours and not changed:
+        return "unchanged"
+    if table_is_ours and None not in changed:
+        tmp_path = COMPARISON_CSV.with_suffix(".csv.tmp")
+        patched = set()
+        with COMPARISON_CSV.open(encoding="utf-8-sig", newline="") as src, tmp_path.open("w", encoding="utf-8-sig", newline="") as dst:
+            reader = csv.reader(src)
+            writer = csv.writer(dst)
+            header = next(reader, [])
+            writer.writerow(header)
+            for values in reader:
+                item = changed.get(values[0]) if values else None
+                if item is not None:
+                    values = build_dataset.comparison_row(item)
+                    patched.add(values[0])
+                writer.writerow(values)
+        if header == build_dataset.COMPARISON_HEADER and patched == set(changed):
+            tmp_path.replace(COMPARISON_CSV)
+            state["comparison_sha256"] = file_digest(COMPARISON_CSV)
+            return "patched"
+        # Items were added, removed or renamed since the last sync.
+        tmp_path.unlink()
+
+    build_dataset.write_comparison_table(list(catalog.artworks_catalog(ARTWORKS_JSON)))
+    state["comparison_sha256"] = file_digest(COMPARISON_CSV)
+    return "rebuilt"
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Sync verified works.csv fields back into app/data artifacts.")
+    parser.add_argument("--full", action="store_true", help="re-sync every item and rebuild the comparison table")
+    parser.add_argument("--reproducible", action="store_true", help="keep the build's generatedAt so unchanged inputs give unchanged bytes")
+    args = parser.parse_args()
+
     if not WORKS_CSV.exists():
         raise SystemExit(f"Missing {WORKS_CSV}")
     if not ARTWORKS_JSON.exists():
         raise SystemExit(f"Missing {ARTWORKS_JSON}")
 
-    bg_count, verified_count = sync_artworks_json()
-    rebuild_comparison_table()
+    state = {} if args.full else load_sync_state()
+    bg_count, verified_count, changed, skipped = sync_artworks_json(state, full=args.full, reproducible=build_dataset.reproducible_mode(args.reproducible))
+    table = rebuild_comparison_table(state, changed)
+    save_sync_state(state)
     print(f"Background synced for {bg_count} items")
     print(f"Verified period/source synced for {verified_count} items")
-    print("Rebuilt app/data/comparison_table.csv")
+    print(f"Changed {len(changed)} items; skipped {skipped} unchanged since the last sync")
+    if changed:
+        print(f"Wrote {ARTWORKS_JSON}")
+    if table == "unchanged":
+        print("app/data/comparison_table.csv already up to date")
+    else:
+        print(f"{table.capitalize()} app/data/comparison_table.csv")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""Span tracing for build_verified_works.py.
+
+A Tracer records nested, timed spans with attributes (row id, URL, host,
+status, bytes) from any thread and writes them as a Chrome trace
+(chrome://tracing, Perfetto) or, for paths ending in .speedscope.json, a
+speedscope file. No collector or extra package is needed.
+
+The verifier's default tracer is disabled: span() then returns one shared
+no-op object, so instrumented code pays a method call and nothing else.
+
+Usage (summarise a saved trace):
+    python3 scripts/tracing.py screen_results/trace.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+
+# Spans beyond this are counted but not kept, so a huge run cannot exhaust memory.
+MAX_SPANS = 2_000_000
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+# (name, thread id, start ns, end ns, attributes)
+SpanRecord = Tuple[str, int, int, int, Dict[str, object]]
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+    def set(self, **attrs) -> None:
+        return None
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Span:
+    __slots__ = ("tracer", "name", "attrs", "start")
+
+    def __init__(self, tracer: "Tracer", name: str, attrs: Dict[str, object]) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+        self.start = 0
+
+    def __enter__(self) -> "Span":
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        self.tracer.add(self.name, self.start, time.perf_counter_ns(), self.attrs)
+
+    def set(self, **attrs) -> None:
+        self.attrs.update(attrs)
+
+
+class Tracer:
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.spans: List[SpanRecord] = []
+        self.dropped = 0
+        self.thread_names: Dict[int, str] = {}
+        self.origin = time.perf_counter_ns()
+
+    def span(self, name: str, **attrs):
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, attrs)
+
+    def add(self, name: str, start: int, end: int, attrs: Dict[str, object]) -> None:
+        tid = threading.get_ident()
+        with self.lock:
+            if tid not in self.thread_names:
+                self.thread_names[tid] = threading.current_thread().name
+            if len(self.spans) >= MAX_SPANS:
+                self.dropped += 1
+                return
+            self.spans.append((name, tid, start, end, attrs))
+
+    def _snapshot(self) -> Tuple[List[SpanRecord], Dict[int, int], Dict[int, str]]:
+        with self.lock:
+            spans = list(self.spans)
+            names = dict(self.thread_names)
+        # Small stable thread numbers read better than OS thread idents.
+        tids = {tid: i + 1 for i, tid in enumerate(sorted(names))}
+        return spans, tids, names
+
+    def chrome_trace(self) -> Dict[str, object]:
+        spans, tids, names = self._snapshot()
+        pid = os.getpid()
+        events: List[Dict[str, object]] = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tids[tid], "args": {"name": name}}
+            for tid, name in names.items()
+        ]
+        for name, tid, start, end, attrs in sorted(spans, key=lambda s: (s[2], -s[3])):
+            events.append(
+                {
+                    "name": name,
+                    "ph": "X",
+                    "ts": (start - self.origin) / 1000,
+                    "dur": (end - start) / 1000,
+                    "pid": pid,
+                    "tid": tids[tid],
+                    "args": attrs,
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"dropped_spans": self.dropped}}
+
+    def speedscope(self) -> Dict[str, object]:
+        spans, tids, names = self._snapshot()
+        frames: List[Dict[str, str]] = []
+        frame_ids: Dict[str, int] = {}
+        by_thread: Dict[int, List[SpanRecord]] = {}
+        for s in spans:
+            by_thread.setdefault(s[1], []).append(s)
+            if s[0] not in frame_ids:
+                frame_ids[s[0]] = len(frames)
+                frames.append({"name": s[0]})
+
+        profiles = []
+        for tid, thread_spans in sorted(by_thread.items(), key=lambda kv: tids[kv[0]]):
+            thread_spans.sort(key=lambda s: (s[2], -s[3]))
+            events: List[Dict[str, object]] = []
+            stack: List[SpanRecord] = []
+            for s in thread_spans:
+                while stack and stack[-1][3] <= s[2]:
+                    done = stack.pop()
+                    events.append({"type": "C", "frame": frame_ids[done[0]], "at": (done[3] - self.origin) / 1000})
+                events.append({"type": "O", "frame": frame_ids[s[0]], "at": (s[2] - self.origin) / 1000})
+                stack.append(s)
+            while stack:
+                done = stack.pop()
+                events.append({"type": "C", "frame": frame_ids[done[0]], "at": (done[3] - self.origin) / 1000})
+            profiles.append(
+                {
+                    "type": "evented",
+                    "name": f"{names[tid]} ({tids[tid]})",
+                    "unit": "microseconds",
+                    "startValue": events[0]["at"],
+                    "endValue": events[-1]["at"],
+                    "events": events,
+                }
+            )
+        return {"$schema": SPEEDSCOPE_SCHEMA, "shared": {"frames": frames}, "profiles": profiles, "name": "build_verified_works"}
+
+    def write(self, path: Path) -> None:
+        data = self.speedscope() if path.name.endswith(".speedscope.json") else self.chrome_trace()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(data, ensure_ascii=False, default=str), encoding="utf-8")
+
+
+def summarize(events: List[Dict[str, object]], top: int) -> None:
+    totals: Dict[str, List[float]] = {}
+    slowest: List[Tuple[float, str, Dict[str, object]]] = []
+    for e in events:
+        if e.get("ph") != "X":
+            continue
+        totals.setdefault(e["name"], []).append(e["dur"])
+        slowest.append((e["dur"], e["name"], e.get("args") or {}))
+    print(f"{'span':<20} {'count':>8} {'total ms':>12} {'max ms':>10}")
+    for name, durs in sorted(totals.items(), key=lambda kv: -sum(kv[1])):
+        print(f"{name:<20} {len(durs):>8} {sum(durs) / 1000:>12.1f} {max(durs) / 1000:>10.1f}")
+    print(f"\nSlowest {top} spans:")
+    for dur, name, args in sorted(slowest, key=lambda s: -s[0])[:top]:
+        detail = " ".join(f"{k}={v}" for k, v in args.items())
+        print(f"  {dur / 1000:>9.1f} ms  {name}  {detail}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Summarise a Chrome trace written by build_verified_works.py --trace.")
+    parser.add_argument("trace", type=Path)
+    parser.add_argument("--top", type=int, default=15, help="slowest spans to list")
+    args = parser.parse_args()
+
+    if not args.trace.exists():
+        print(f"Missing input: {args.trace}", file=sys.stderr)
+        return 1
+    data = json.loads(args.trace.read_text(encoding="utf-8"))
+    if "traceEvents" not in data:
+        print("Only Chrome trace files can be summarised; open .speedscope.json files in speedscope.", file=sys.stderr)
+        return 1
+    summarize(data["traceEvents"], args.top)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
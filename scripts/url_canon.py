@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Canonical forms of source URLs, used as cache and dedupe keys.
+
+canonical_url() returns a fetchable URL with presentation-only variation
+removed (scheme, case, default ports, fragments, tracking parameters,
+trailing slashes) plus per-institution rules that reduce object pages to
+their stable id. url_key() additionally drops a leading "www." so both host
+spellings share one key.
+
+Usage:
+    python3 scripts/url_canon.py URL [URL ...]
+"""
+
+from __future__ import annotations
+
+import re
+import sys
+from typing import Callable, List, Optional, Tuple
+from urllib.parse import parse_qsl, quote, unquote, urlencode, urlsplit, urlunsplit
+
+
+TRACKING_PARAMS = {"fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "_ga", "_gl", "igshid", "ref", "ref_src"}
+TRACKING_PREFIXES = ("utm_",)
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def _met_object(host: str, path: str) -> Optional[str]:
+    if host == "metmuseum.org" or host.endswith(".metmuseum.org"):
+        m = re.match(r"^(?:/[a-z]{2})?/art/collection/search/(\d+)", path) or re.match(
+            r"^/public/collection/v1/objects/(\d+)", path
+        )
+        if m:
+            return f"https://www.metmuseum.org/art/collection/search/{m.group(1)}"
+    return None
+
+
+def _vam_item(host: str, path: str) -> Optional[str]:
+    # collections.vam.ac.uk/item/O12345/any-slug/ -> /item/O12345
+    m = re.match(r"^/item/(O\d+)", path)
+    if host == "collections.vam.ac.uk" and m:
+        return f"https://collections.vam.ac.uk/item/{m.group(1)}"
+    return None
+
+
+def _artic_artwork(host: str, path: str) -> Optional[str]:
+    m = re.match(r"^/artworks/(\d+)", path)
+    if (host == "artic.edu" or host.endswith(".artic.edu")) and m:
+        return f"https://www.artic.edu/artworks/{m.group(1)}"
+    return None
+
+
+def _emuseum_object(host: str, path: str) -> Optional[str]:
+    # *.emuseum.com/objects/3614/chair and cmog-style /objects/<id>/<slug>
+    m = re.match(r"^/objects/(\d+)", path)
+    if m and (host.endswith(".emuseum.com") or host in {"glasscollection.cmog.org", "art.nelson-atkins.org"}):
+        return f"https://{host}/objects/{m.group(1)}"
+    return None
+
+
+def _wikipedia(host: str, path: str) -> Optional[str]:
+    # Mobile hosts and percent-encoding variants share the desktop article URL.
+    m = re.match(r"^([a-z-]+)\.(?:m\.)?wikipedia\.org$", host)
+    if m and path.startswith("/wiki/"):
+        title = unquote(path[len("/wiki/"):]).replace(" ", "_")
+        return f"https://{m.group(1)}.wikipedia.org/wiki/{quote(title, safe='/_(),.:-!~*')}"
+    return None
+
+
+INSTITUTION_RULES: List[Callable[[str, str], Optional[str]]] = [
+    _met_object,
+    _vam_item,
+    _artic_artwork,
+    _emuseum_object,
+    _wikipedia,
+]
+
+
+def _clean_query(query: str) -> str:
+    kept: List[Tuple[str, str]] = [
+        (k, v)
+        for k, v in parse_qsl(query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith(TRACKING_PREFIXES)
+    ]
+    return urlencode(kept)
+
+
+def canonical_url(url: str) -> str:
+    raw = (url or "").strip()
+    try:
+        parts = urlsplit(raw)
+    except ValueError:
+        return raw
+    if parts.scheme.lower() not in DEFAULT_PORTS or not parts.hostname:
+        return raw
+    host = parts.hostname.lower().rstrip(".")
+    path = re.sub(r"/{2,}", "/", parts.path or "/")
+
+    for rule in INSTITUTION_RULES:
+        hit = rule(host, path)
+        if hit:
+            return hit
+
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    netloc = host if port in {None, *DEFAULT_PORTS.values()} else f"{host}:{port}"
+    if len(path) > 1:
+        path = path.rstrip("/")
+    return urlunsplit(("https", netloc, path, _clean_query(parts.query), ""))
+
+
+def url_key(url: str) -> str:
+    canon = canonical_url(url)
+    return re.sub(r"^https://www\.", "https://", canon)
+
+
+def main() -> int:
+    if len(sys.argv) < 2:
+        print(__doc__.strip().splitlines()[-1].strip(), file=sys.stderr)
+        return 1
+    for url in sys.argv[1:]:
+        print(f"{url}\n  canonical: {canonical_url(url)}\n  key:       {url_key(url)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())